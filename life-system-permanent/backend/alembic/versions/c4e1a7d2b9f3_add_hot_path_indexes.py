@@ -0,0 +1,79 @@
+"""add hot path indexes
+
+Revision ID: c4e1a7d2b9f3
+Revises: 9b36faade8ae
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1a7d2b9f3'
+down_revision: Union[str, Sequence[str], None] = '9b36faade8ae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nome, tabela, colunas, predicado do índice parcial)
+INDEXES = [
+    # get_quests: WHERE user_id = ? AND is_completed = false ORDER BY created_at DESC
+    ('ix_quests_user_open_created', 'quests',
+     ['user_id', 'is_completed', sa.text('created_at DESC')], None),
+    # Sweep de punição: DAILY abertas por due_date
+    ('ix_quests_open_daily_due', 'quests', ['due_date'],
+     sa.text("category = 'DAILY' AND status IS DISTINCT FROM 'COMPLETED' "
+             "AND status IS DISTINCT FROM 'FAILED'")),
+    # CRUD de finanças e corpo: WHERE user_id = ? ORDER BY date DESC (id desempata)
+    ('ix_finance_transactions_user_date', 'finance_transactions',
+     ['user_id', sa.text('date DESC'), sa.text('id DESC')], None),
+    ('ix_body_metrics_user_date', 'body_metrics',
+     ['user_id', sa.text('date DESC'), sa.text('id DESC')], None),
+]
+
+
+def upgrade() -> None:
+    """Cria os índices com CONCURRENTLY (sem travar escrita), pulando os que já existem."""
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    existing_tables = inspector.get_table_names()
+
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de transação
+    with op.get_context().autocommit_block():
+        for name, table_name, columns, where in INDEXES:
+            if table_name not in existing_tables:
+                print(f"Table '{table_name}' does not exist. Skipping index {name}.")
+                continue
+
+            existing_indexes = [i['name'] for i in inspector.get_indexes(table_name)]
+            if name in existing_indexes:
+                print(f"Index {name} already exists on {table_name}. Skipping.")
+                continue
+
+            op.create_index(
+                name,
+                table_name,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=where,
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    existing_tables = inspector.get_table_names()
+
+    with op.get_context().autocommit_block():
+        for name, table_name, _, _ in reversed(INDEXES):
+            if table_name not in existing_tables:
+                continue
+
+            existing_indexes = [i['name'] for i in inspector.get_indexes(table_name)]
+            if name in existing_indexes:
+                op.drop_index(name, table_name=table_name, postgresql_concurrently=True)
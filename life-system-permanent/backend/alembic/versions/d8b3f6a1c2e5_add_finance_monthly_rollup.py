@@ -0,0 +1,61 @@
+"""add finance monthly rollup
+
+Revision ID: d8b3f6a1c2e5
+Revises: c4e1a7d2b9f3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b3f6a1c2e5'
+down_revision: Union[str, Sequence[str], None] = 'c4e1a7d2b9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Cria finance_monthly_rollup e faz o backfill a partir de finance_transactions."""
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    existing_tables = inspector.get_table_names()
+
+    if 'finance_monthly_rollup' in existing_tables:
+        print("Table 'finance_monthly_rollup' already exists. Skipping.")
+        return
+
+    # O tipo financetypeenum já existe (criado junto com finance_transactions)
+    finance_type = postgresql.ENUM('INCOME', 'EXPENSE', name='financetypeenum', create_type=False)
+
+    op.create_table(
+        'finance_monthly_rollup',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False, comment='Primeiro dia do mês'),
+        sa.Column('type', finance_type, nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('total', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('transactions', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'month', 'type', 'category'),
+    )
+
+    if 'finance_transactions' in existing_tables:
+        op.execute(sa.text("""
+            INSERT INTO finance_monthly_rollup (user_id, month, type, category, total, transactions)
+            SELECT user_id, date_trunc('month', date)::date, type, category, sum(amount), count(*)
+            FROM finance_transactions
+            GROUP BY user_id, date_trunc('month', date)::date, type, category
+        """))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    if 'finance_monthly_rollup' in inspector.get_table_names():
+        op.drop_table('finance_monthly_rollup')
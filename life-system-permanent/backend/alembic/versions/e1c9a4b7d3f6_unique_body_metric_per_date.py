@@ -0,0 +1,59 @@
+"""unique body metric per (user_id, date)
+
+Revision ID: e1c9a4b7d3f6
+Revises: d8b3f6a1c2e5
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1c9a4b7d3f6'
+down_revision: Union[str, Sequence[str], None] = 'd8b3f6a1c2e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CONSTRAINT = 'uq_body_metrics_user_date'
+
+
+def upgrade() -> None:
+    """Remove medições duplicadas (mantém a mais recente) e cria a constraint única."""
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    if 'body_metrics' not in inspector.get_table_names():
+        print("Table 'body_metrics' does not exist. Skipping.")
+        return
+
+    existing = [c['name'] for c in inspector.get_unique_constraints('body_metrics')]
+    if CONSTRAINT in existing:
+        print(f"Constraint {CONSTRAINT} already exists. Skipping.")
+        return
+
+    # Sem isso a constraint falharia em bancos com a mesma leitura gravada duas vezes
+    op.execute(sa.text("""
+        DELETE FROM body_metrics b
+        USING body_metrics newer
+        WHERE newer.user_id = b.user_id
+          AND newer.date = b.date
+          AND newer.id > b.id
+    """))
+
+    op.create_unique_constraint(CONSTRAINT, 'body_metrics', ['user_id', 'date'])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    if 'body_metrics' not in inspector.get_table_names():
+        return
+
+    existing = [c['name'] for c in inspector.get_unique_constraints('body_metrics')]
+    if CONSTRAINT in existing:
+        op.drop_constraint(CONSTRAINT, 'body_metrics', type_='unique')
@@ -0,0 +1,69 @@
+"""quests.created_at not null
+
+Revision ID: f3a8c6d1b2e4
+Revises: e1c9a4b7d3f6
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c6d1b2e4'
+down_revision: Union[str, Sequence[str], None] = 'e1c9a4b7d3f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _created_at(inspector):
+    return next(
+        (c for c in inspector.get_columns('quests') if c['name'] == 'created_at'), None
+    )
+
+
+def upgrade() -> None:
+    """
+    Preenche created_at nulo e torna a coluna NOT NULL: a listagem de quests pagina
+    por (created_at, id) e uma linha nula quebraria o cursor e sumiria das páginas.
+    """
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+
+    if 'quests' not in inspector.get_table_names():
+        print("Table 'quests' does not exist. Skipping.")
+        return
+
+    column = _created_at(inspector)
+    if column is None or not column['nullable']:
+        print("Column quests.created_at already NOT NULL. Skipping.")
+        return
+
+    op.execute(sa.text(
+        "UPDATE quests SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL"
+    ))
+    op.alter_column(
+        'quests', 'created_at',
+        existing_type=sa.DateTime(),
+        existing_server_default=sa.text('now()'),
+        nullable=False,
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = Inspector.from_engine(bind)
+    if 'quests' not in inspector.get_table_names():
+        return
+
+    column = _created_at(inspector)
+    if column is not None and not column['nullable']:
+        op.alter_column(
+            'quests', 'created_at',
+            existing_type=sa.DateTime(),
+            existing_server_default=sa.text('now()'),
+            nullable=True,
+        )
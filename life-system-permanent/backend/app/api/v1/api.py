@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, gamification, finance, quests, stats, rank, body
+from app.api.v1.endpoints import auth, gamification, finance, quests, stats, rank, body, dashboard
 
 api_router = APIRouter()
 
@@ -11,3 +11,4 @@ api_router.include_router(quests.router, prefix="/quests", tags=["quests"])
 api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
 api_router.include_router(rank.router, prefix="/rank", tags=["rank"])
 api_router.include_router(body.router, prefix="/body", tags=["body"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
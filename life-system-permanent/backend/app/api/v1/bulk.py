@@ -0,0 +1,49 @@
+"""
+Bulk - Leitura limitada e parsing (JSON ou NDJSON) do corpo dos endpoints em lote
+"""
+
+from typing import List, Type
+
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+async def read_bulk_body(request: Request, max_bytes: int) -> bytes:
+    """
+    Lê o corpo inteiro sem passar de `max_bytes`.
+    Content-Length declarado é validado antes de ler; o stream é cortado ao estourar
+    o limite, já que o header pode faltar (chunked) ou mentir.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length:
+        try:
+            declared_length = int(content_length)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Content-Length inválido")
+        if declared_length > max_bytes:
+            raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail="Payload muito grande")
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail="Payload muito grande")
+    return bytes(body)
+
+
+def parse_bulk_items(
+    request: Request,
+    body: bytes,
+    model: Type[BaseModel],
+    list_adapter: TypeAdapter,
+) -> List[BaseModel]:
+    """
+    Valida `body` como NDJSON (Content-Type com "ndjson", um `model` por linha)
+    ou como array JSON via `list_adapter`. Erros de validação viram 422.
+    """
+    try:
+        if "ndjson" in request.headers.get("content-type", ""):
+            return [model.model_validate_json(line) for line in body.splitlines() if line.strip()]
+        return list_adapter.validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=e.errors(include_url=False))
@@ -7,7 +7,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import decode_token
+from app.core.security import decode_token, TOKEN_PRINCIPAL_CLAIMS
 from app.models import User
 from app.services import AuthService
 
@@ -36,12 +36,24 @@ async def get_current_user(
             detail="Token inválido",
         )
     
-    try:
-        user = await AuthService.get_current_user(db, int(user_id))
-    except ValueError:
+    # Modo claims: o token já traz o principal, sem cache nem banco
+    user = None
+    if TOKEN_PRINCIPAL_CLAIMS:
+        user = AuthService.principal_from_claims(int(user_id), payload)
+    
+    if user is None:
+        try:
+            user = await AuthService.get_current_user(db, int(user_id))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Usuário não encontrado",
+            )
+    
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário não encontrado",
+            detail="Usuário inativo",
         )
     
     return user
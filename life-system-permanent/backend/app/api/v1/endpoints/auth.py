@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.security import HashingOverloadedError
 from app.schemas import UserRegister, UserLogin, TokenResponse, UserResponse
 from app.services import AuthService
 from app.api.v1.dependencies import get_current_user
@@ -20,6 +21,8 @@ async def register(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
     try:
         user = await AuthService.register(db, user_data)
         return user
+    except HashingOverloadedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -30,11 +33,20 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     try:
         user, token = await AuthService.login(db, credentials.email, credentials.password)
         return TokenResponse(access_token=token)
+    except HashingOverloadedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
     """Obtém dados do usuário atual."""
-    return current_user
+    # No modo claims o principal não tem email/created_at; busca o registro completo (cacheado)
+    try:
+        return await AuthService.get_current_user(db, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
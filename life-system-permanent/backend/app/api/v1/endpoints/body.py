@@ -1,29 +1,113 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Any, List, Optional
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app import crud
-from app.schemas.body import BodyMetricResponse, BodyMetricCreate
+from app.crud.crud_body import EXPORT_COLUMNS
+from app.schemas.body import (
+    BodyMetricResponse,
+    BodyMetricCreate,
+    BodyMetricBulkUpsertResponse,
+    BodyTrendResponse,
+)
+from app.services import TrendService
 from app.api.v1.dependencies import get_current_user
+from app.api.v1.bulk import parse_bulk_items, read_bulk_body
+from app.api.v1.export import ExportFormat, export_response
+from app.api.v1.responses import adapter_response
 from app.models import User
 
 router = APIRouter()
 
+# Limits for bulk upserts (years of daily smart-scale readings fit comfortably)
+BULK_BODY_MAX_ITEMS = int(os.getenv("BULK_BODY_MAX_ITEMS", "50000"))
+BULK_BODY_MAX_BYTES = int(os.getenv("BULK_BODY_MAX_BYTES", str(10 * 1024 * 1024)))
+
+body_metric_list_adapter = TypeAdapter(List[BodyMetricCreate])
+body_metric_response_list_adapter = TypeAdapter(List[BodyMetricResponse])
+
 @router.get("/", response_model=List[BodyMetricResponse])
 async def read_body_metrics(
     db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """
-    Retrieve body metrics.
+    Retrieve body metrics, newest first.
+    Pass the `X-Next-Cursor` response header back as `cursor` for the next page;
+    `skip` is still accepted when no cursor is given.
     """
-    metrics = await crud.body.get_multi_by_owner(
-        db=db, user_id=current_user.id, skip=skip, limit=limit
+    try:
+        metrics, next_cursor = await crud.body.get_page_by_owner(
+            db=db,
+            user_id=current_user.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            date_from=date_from,
+            date_to=date_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return adapter_response(body_metric_response_list_adapter, metrics, headers=headers)
+
+@router.get("/trend", response_model=BodyTrendResponse)
+async def read_body_trend(
+    db: AsyncSession = Depends(get_db),
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    points: int = Query(200, ge=3, le=2000),
+    window: int = Query(7, ge=1, le=365),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Chart-ready series for weight, muscle_mass and fat_percentage.
+    Each series is downsampled to at most `points` points (LTTB) and carries a
+    moving average over `window` measurements and the daily rate of change,
+    both computed on the full-resolution data.
+    """
+    return await TrendService.body_trend(
+        db,
+        current_user.id,
+        date_from=date_from,
+        date_to=date_to,
+        points=points,
+        window=window,
+    )
+
+@router.get("/export")
+async def export_body_metrics(
+    format: ExportFormat = "csv",
+    gzip: bool = False,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Stream the full history of body metrics (oldest first) as CSV or NDJSON.
+    Rows are read through a server-side cursor; `gzip=true` compresses on the fly
+    and sets `Content-Encoding: gzip`.
+    """
+    user_id = current_user.id
+
+    def fetch(db: AsyncSession, yield_per: int):
+        return crud.body.stream_by_owner(
+            db, user_id=user_id, date_from=date_from, date_to=date_to, yield_per=yield_per
+        )
+
+    return export_response(
+        fetch, EXPORT_COLUMNS, format=format, gzip=gzip, filename="body-export"
     )
-    return metrics
 
 @router.post("/", response_model=BodyMetricResponse)
 async def create_body_metric(
@@ -39,3 +123,27 @@ async def create_body_metric(
         db=db, obj_in=metric_in, user_id=current_user.id
     )
     return metric
+
+@router.post("/bulk", response_model=BodyMetricBulkUpsertResponse)
+async def upsert_body_metrics_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Insert or update many body metrics at once, keyed by (user, date).
+    Accepts a JSON array of readings or an NDJSON file (Content-Type: application/x-ndjson).
+    Re-sending the same export is idempotent: identical readings are left untouched.
+    """
+    body = await read_bulk_body(request, BULK_BODY_MAX_BYTES)
+    metrics_in = parse_bulk_items(request, body, BodyMetricCreate, body_metric_list_adapter)
+
+    if not metrics_in:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No body metrics sent")
+    if len(metrics_in) > BULK_BODY_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"At most {BULK_BODY_MAX_ITEMS} body metrics per request",
+        )
+
+    return await crud.body.upsert_bulk(db, objs_in=metrics_in, user_id=current_user.id)
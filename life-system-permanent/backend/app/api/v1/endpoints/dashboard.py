@@ -0,0 +1,21 @@
+from typing import Any
+from fastapi import APIRouter, Depends, Query
+
+from app.schemas.dashboard import DashboardResponse
+from app.services import DashboardService
+from app.api.v1.dependencies import get_current_user
+from app.models import User
+
+router = APIRouter()
+
+@router.get("/", response_model=DashboardResponse)
+async def get_dashboard(
+    quests: int = Query(5, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Home screen in one call: player stats, the newest `quests` active quests,
+    current-month finance totals and the latest body metric.
+    The sub-queries run concurrently, each on its own pooled connection.
+    """
+    return await DashboardService.get_dashboard(current_user.id, quest_limit=quests)
@@ -1,29 +1,127 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from datetime import date, datetime
+from typing import Any, List, Literal, Optional
+import json
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app import crud
-from app.schemas.finance import FinanceTransactionResponse, FinanceTransactionCreate
+from app.crud.crud_finance import EXPORT_COLUMNS
+from app.schemas.finance import (
+    FinanceTransactionResponse,
+    FinanceTransactionCreate,
+    FinanceSummaryResponse,
+    FinanceForecastResponse,
+    FinanceImportResponse,
+)
+from app.services import ImportService, StatementFormatError, StatementTooLargeError
+from app.services.forecast_service import ForecastService, FORECAST_MAX_MONTHS
+from app.models.models import FinanceTypeEnum
 from app.api.v1.dependencies import get_current_user
+from app.api.v1.export import ExportFormat, export_response
+from app.api.v1.responses import adapter_response
 from app.models import User
 
 router = APIRouter()
 
+finance_transaction_list_adapter = TypeAdapter(List[FinanceTransactionResponse])
+
 @router.get("/", response_model=List[FinanceTransactionResponse])
 async def read_finance_transactions(
     db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    type: Optional[FinanceTypeEnum] = None,
+    category: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Retrieve finance transactions, newest first.
+    Pass the `X-Next-Cursor` response header back as `cursor` for the next page;
+    `skip` is still accepted when no cursor is given.
+    """
+    try:
+        transactions, next_cursor = await crud.finance.get_page_by_owner(
+            db=db,
+            user_id=current_user.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            date_from=date_from,
+            date_to=date_to,
+            type=type,
+            category=category,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return adapter_response(finance_transaction_list_adapter, transactions, headers=headers)
+
+@router.get("/summary", response_model=FinanceSummaryResponse)
+async def read_finance_summary(
+    db: AsyncSession = Depends(get_db),
+    month_from: Optional[date] = None,
+    month_to: Optional[date] = None,
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """
-    Retrieve finance transactions.
+    Income, expense, balance and per-category totals for a month range (inclusive).
+    Any day inside a month selects that month; both default to the current month.
     """
-    transactions = await crud.finance.get_multi_by_owner(
-        db=db, user_id=current_user.id, skip=skip, limit=limit
+    today = date.today()
+    month_from = month_from or month_to or today
+    month_to = month_to or max(month_from, today)
+    if month_from > month_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="month_from must not be after month_to",
+        )
+
+    return await crud.finance.get_summary(
+        db=db, user_id=current_user.id, month_from=month_from, month_to=month_to
+    )
+
+@router.get("/forecast", response_model=FinanceForecastResponse)
+async def read_finance_forecast(
+    db: AsyncSession = Depends(get_db),
+    months: int = Query(6, ge=1, le=FORECAST_MAX_MONTHS),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Project the next `months` months: recurring (is_fixed) items repeat monthly and
+    variable spend uses the trailing per-category average.
+    Cached per user until the next finance write.
+    """
+    return await ForecastService.forecast(db, current_user.id, months)
+
+@router.get("/export")
+async def export_finance_transactions(
+    format: ExportFormat = "csv",
+    gzip: bool = False,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Stream the full history of finance transactions (oldest first) as CSV or NDJSON.
+    Rows are read through a server-side cursor; `gzip=true` compresses on the fly
+    and sets `Content-Encoding: gzip`.
+    """
+    user_id = current_user.id
+
+    def fetch(db: AsyncSession, yield_per: int):
+        return crud.finance.stream_by_owner(
+            db, user_id=user_id, date_from=date_from, date_to=date_to, yield_per=yield_per
+        )
+
+    return export_response(
+        fetch, EXPORT_COLUMNS, format=format, gzip=gzip, filename="finance-export"
     )
-    return transactions
 
 @router.post("/", response_model=FinanceTransactionResponse)
 async def create_finance_transaction(
@@ -38,4 +136,68 @@ async def create_finance_transaction(
     transaction = await crud.finance.create(
         db=db, obj_in=transaction_in, user_id=current_user.id
     )
+    ForecastService.invalidate(current_user.id)
     return transaction
+
+@router.post("/import", response_model=FinanceImportResponse)
+async def import_finance_statement(
+    *,
+    db: AsyncSession = Depends(get_db),
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ofx"]] = Form(None),
+    encoding: str = Form("utf-8-sig"),
+    category_map: Optional[str] = Form(None),
+    import_id: Optional[str] = Form(None),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Import a CSV or OFX bank statement (multipart upload), streamed in chunks.
+
+    - `format` is detected from the file name/header when omitted.
+    - `category_map` is an optional JSON object of description keyword -> category,
+      checked before the built-in rules; a CSV `category` column always wins.
+    - Rows already stored (same date, type, amount and description) are skipped.
+    - Pass an `import_id` to poll `GET /finance/import/{import_id}` for progress.
+    """
+    try:
+        category_rules = json.loads(category_map) if category_map else None
+        if category_rules is not None and not isinstance(category_rules, dict):
+            raise ValueError
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="category_map must be a JSON object",
+        )
+
+    try:
+        summary = await ImportService.import_statement(
+            db,
+            current_user.id,
+            file,
+            format=format,
+            encoding=encoding,
+            category_rules=category_rules,
+            import_id=import_id,
+        )
+    except LookupError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown encoding")
+    except StatementTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except StatementFormatError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    finally:
+        ForecastService.invalidate(current_user.id)
+    return summary
+
+@router.get("/import/{import_id}", response_model=FinanceImportResponse)
+async def read_finance_import_progress(
+    import_id: str,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Progress of an import started with the given `import_id`.
+    """
+    progress = ImportService.progress(current_user.id, import_id)
+    if progress is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+    return progress
@@ -1,56 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+import os
+
+from app import crud
+from app.crud.crud_quest import COPY_THRESHOLD
 
 from app.core.database import get_db
 from app.api.v1.dependencies import get_current_user
-from app.models import User, PlayerStats, Quest, QuestDifficultyEnum, AttributeRewardEnum
+from app.api.v1.bulk import parse_bulk_items, read_bulk_body
+from app.api.v1.responses import adapter_response
+from app.models import (
+    User,
+    Quest,
+    QuestCategoryEnum,
+    QuestDifficultyEnum,
+    QuestStatusEnum,
+)
+from app.services import QuestService, QuestNotFoundError, QuestAlreadyCompletedError
 from app.schemas import (
     PlayerStatsResponse,
     QuestCreate,
     QuestResponse,
+    QuestListItem,
     QuestCompleteResponse,
+    QuestBulkCreateResponse,
     QuestDifficultyEnum as QuestDifficultyEnumSchema,
     AttributeRewardEnum as AttributeRewardEnumSchema
 )
 
 router = APIRouter()
 
+# Limites da criação em lote
+BULK_QUEST_MAX_ITEMS = int(os.getenv("BULK_QUEST_MAX_ITEMS", "5000"))
+BULK_QUEST_MAX_BYTES = int(os.getenv("BULK_QUEST_MAX_BYTES", str(2 * 1024 * 1024)))
+
+quest_list_adapter = TypeAdapter(List[QuestCreate])
+quest_list_item_adapter = TypeAdapter(List[QuestListItem])
+
 @router.get("/stats", response_model=PlayerStatsResponse)
 async def get_stats(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Obtém estatísticas do jogador atual."""
-    # Ensure stats exist (should be created on user registration, but just in case)
-    stmt = select(PlayerStats).where(PlayerStats.user_id == current_user.id)
-    result = await db.execute(stmt)
-    stats = result.scalar_one_or_none()
-    
-    if not stats:
-        # Create default stats if missing
-        stats = PlayerStats(user_id=current_user.id)
-        db.add(stats)
-        await db.commit()
-        await db.refresh(stats)
-        
-    return stats
+    return await crud.stats.get_or_create_by_owner(db, user_id=current_user.id)
 
-@router.get("/quests", response_model=list[QuestResponse])
+@router.get(
+    "/quests",
+    response_model=list[QuestListItem],
+    response_model_exclude_unset=True,
+)
 async def get_quests(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    category: Optional[QuestCategoryEnum] = None,
+    difficulty: Optional[QuestDifficultyEnum] = None,
+    quest_status: Optional[QuestStatusEnum] = Query(None, alias="status"),
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Colunas separadas por vírgula"),
+    count: Optional[Literal["exact", "estimate"]] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Lista quests ativas do usuário."""
-    stmt = select(Quest).where(
-        Quest.user_id == current_user.id,
-        Quest.is_completed == False
-    ).order_by(Quest.created_at.desc())
-    result = await db.execute(stmt)
-    quests = result.scalars().all()
-    return quests
+    """
+    Lista quests ativas do usuário, mais recentes primeiro.
+    Paginação por cursor (header X-Next-Cursor), filtros no servidor,
+    projeção opcional via `fields=` e total opcional no header X-Total-Count.
+    """
+    filters = {
+        "category": category,
+        "difficulty": difficulty,
+        "status": quest_status,
+        "due_from": due_from,
+        "due_to": due_to,
+    }
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    
+    try:
+        quests, next_cursor = await crud.quest.get_active_page(
+            db,
+            user_id=current_user.id,
+            cursor=cursor,
+            limit=limit,
+            fields=field_list,
+            **filters,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    headers = {}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if count:
+        total = await crud.quest.count_active(
+            db, user_id=current_user.id, estimate=count == "estimate", **filters
+        )
+        headers["X-Total-Count"] = str(total)
+    return adapter_response(quest_list_item_adapter, quests, headers=headers, exclude_unset=True)
 
 @router.post("/quests", response_model=QuestResponse)
 async def create_quest(
@@ -75,6 +125,35 @@ async def create_quest(
     await db.refresh(quest)
     return quest
 
+@router.post("/quests/bulk", response_model=QuestBulkCreateResponse)
+async def create_quests_bulk(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Cria várias quests de uma vez.
+    Aceita um array JSON de QuestCreate ou NDJSON (Content-Type: application/x-ndjson).
+    Lotes grandes são ingeridos via COPY e retornam apenas a contagem.
+    """
+    body = await read_bulk_body(request, BULK_QUEST_MAX_BYTES)
+    quests_in = parse_bulk_items(request, body, QuestCreate, quest_list_adapter)
+    
+    if not quests_in:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nenhuma quest enviada")
+    if len(quests_in) > BULK_QUEST_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Máximo de {BULK_QUEST_MAX_ITEMS} quests por requisição",
+        )
+    
+    if len(quests_in) > COPY_THRESHOLD:
+        created = await crud.quest.copy_bulk(db, objs_in=quests_in, user_id=current_user.id)
+        return QuestBulkCreateResponse(created=created)
+    
+    quests = await crud.quest.create_bulk(db, objs_in=quests_in, user_id=current_user.id)
+    return QuestBulkCreateResponse(created=len(quests), quests=quests)
+
 @router.post("/quests/{quest_id}/complete", response_model=QuestCompleteResponse)
 async def complete_quest(
     quest_id: int,
@@ -83,75 +162,25 @@ async def complete_quest(
 ):
     """
     Completa uma quest e atribui recompensas.
-    Lógica de Level Up: Se current_xp >= level * 100 -> Level Up.
+    Level Up via `progression` (pode subir vários níveis de uma vez).
     """
-    # 1. Get Quest
-    stmt = select(Quest).where(Quest.id == quest_id, Quest.user_id == current_user.id)
-    result = await db.execute(stmt)
-    quest = result.scalar_one_or_none()
-    
-    if not quest:
-        raise HTTPException(status_code=404, detail="Quest não encontrada")
-        
-    if quest.is_completed:
-        raise HTTPException(status_code=400, detail="Quest já completada")
-        
-    # 2. Get Player Stats
-    stmt_stats = select(PlayerStats).where(PlayerStats.user_id == current_user.id)
-    result_stats = await db.execute(stmt_stats)
-    stats = result_stats.scalar_one_or_none()
-    
-    if not stats:
-        stats = PlayerStats(user_id=current_user.id)
-        db.add(stats)
-    
-    # 3. Apply Rewards
-    quest.is_completed = True
-    quest.completed_at = datetime.now()
-    
-    xp_gained = quest.xp_reward
-    stats.current_xp += xp_gained
-    
-    # Attribute Reward
-    attribute_updated = "None"
-    if quest.attribute_reward:
-        if quest.attribute_reward == AttributeRewardEnum.STR:
-            stats.strength += 1
-            attribute_updated = "Strength"
-        elif quest.attribute_reward == AttributeRewardEnum.INT:
-            stats.intelligence += 1
-            attribute_updated = "Intelligence"
-        elif quest.attribute_reward == AttributeRewardEnum.FOC:
-            stats.focus += 1
-            attribute_updated = "Focus"
-            
-    # 4. Level Up Logic
-    level_up = False
-    old_level = stats.level
-    new_level = stats.level
-    
-    xp_threshold = stats.level * 100
-    
-    if stats.current_xp >= xp_threshold:
-        level_up = True
-        stats.level += 1
-        stats.current_xp -= xp_threshold  # Carry over remainder
-        stats.hp += 10  # Increase HP
-        new_level = stats.level
-        
-    await db.commit()
-    await db.refresh(quest)
+    try:
+        completion = await QuestService.complete_quest(db, current_user.id, quest_id)
+    except QuestNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except QuestAlreadyCompletedError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    message = f"Quest completada! Ganhou {xp_gained} XP."
-    if level_up:
-        message += f" LEVEL UP! Você alcançou o nível {new_level}!"
+    message = f"Quest completada! Ganhou {completion.xp_gained} XP."
+    if completion.level_up:
+        message += f" LEVEL UP! Você alcançou o nível {completion.new_level}!"
         
     return QuestCompleteResponse(
-        quest=quest,
-        xp_gained=xp_gained,
-        level_up=level_up,
-        new_level=new_level if level_up else None,
-        old_level=old_level if level_up else None,
+        quest=QuestResponse.model_validate(completion.quest),
+        xp_gained=completion.xp_gained,
+        level_up=completion.level_up,
+        new_level=completion.new_level if completion.level_up else None,
+        old_level=completion.old_level if completion.level_up else None,
         message=message,
-        attribute_updated=attribute_updated
+        attribute_updated=completion.attribute_updated
     )
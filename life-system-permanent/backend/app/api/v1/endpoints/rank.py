@@ -1,7 +1,37 @@
-from fastapi import APIRouter
+from typing import Any, List
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.schemas.rank import RankAroundResponse, RankEntryResponse, RankMetric
+from app.services import RankService
+from app.api.v1.dependencies import get_current_user
+from app.models import User
 
 router = APIRouter()
 
-@router.get("/")
-def get_rank():
-    return [{"id": 1, "name": "Rank Placeholder"}]
+@router.get("/", response_model=List[RankEntryResponse])
+async def get_rank(
+    db: AsyncSession = Depends(get_db),
+    metric: RankMetric = "level",
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+) -> Any:
+    """
+    Leaderboard ordered by `metric` (level/current_xp break ties).
+    Served from the in-memory leaderboard; falls back to SQL while it is not loaded.
+    """
+    return await RankService.top(db, metric, limit, offset)
+
+@router.get("/me", response_model=RankAroundResponse)
+async def get_my_rank(
+    db: AsyncSession = Depends(get_db),
+    metric: RankMetric = "level",
+    radius: int = Query(5, ge=0, le=50),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Current user's position plus `radius` players above and below.
+    """
+    rank, neighbours = await RankService.around(db, current_user.id, metric, radius)
+    return {"metric": metric, "rank": rank, "neighbours": neighbours}
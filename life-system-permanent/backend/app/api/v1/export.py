@@ -0,0 +1,94 @@
+"""
+Export - StreamingResponse em CSV/NDJSON, com gzip opcional, a partir de lotes de linhas
+"""
+
+from typing import AsyncIterator, Callable, Iterable, List, Literal, Mapping, Sequence
+import csv
+import enum
+import io
+import json
+import os
+import zlib
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+
+EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", "1000"))
+
+ExportFormat = Literal["csv", "ndjson"]
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _plain(value):
+    """Valores prontos para CSV/JSON (enums pelo valor, datas em ISO 8601)."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(rows: Iterable[Mapping], columns: Sequence[str], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows([_plain(row[column]) for column in columns] for row in rows)
+    return buffer.getvalue()
+
+
+def _encode_ndjson(rows: Iterable[Mapping], columns: Sequence[str]) -> str:
+    return "".join(
+        json.dumps({column: _plain(row[column]) for column in columns}, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def export_response(
+    fetch: Callable[[AsyncSession, int], AsyncIterator[List[Mapping]]],
+    columns: Sequence[str],
+    *,
+    format: ExportFormat,
+    gzip: bool,
+    filename: str,
+) -> StreamingResponse:
+    """
+    Monta o StreamingResponse de um export.
+
+    `fetch(db, yield_per)` produz lotes de linhas; cada lote vira um pedaço do corpo
+    (comprimido na hora quando `gzip`), então a memória fica constante.
+    A sessão é aberta dentro do gerador: a de `get_db` já foi fechada quando o
+    corpo começa a ser enviado.
+    """
+
+    async def body() -> AsyncIterator[bytes]:
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if gzip else None
+        first = True
+        async with AsyncSessionLocal() as db:
+            async for rows in fetch(db, EXPORT_YIELD_PER):
+                if format == "csv":
+                    chunk = _encode_csv(rows, columns, header=first).encode()
+                else:
+                    chunk = _encode_ndjson(rows, columns).encode()
+                first = False
+                if compressor:
+                    chunk = compressor.compress(chunk)
+                if chunk:
+                    yield chunk
+
+        if format == "csv" and first:
+            chunk = _encode_csv([], columns, header=True).encode()
+            yield compressor.compress(chunk) if compressor else chunk
+        if compressor:
+            yield compressor.flush()
+
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[format], headers=headers)
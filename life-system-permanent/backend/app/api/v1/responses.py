@@ -0,0 +1,24 @@
+"""
+Responses - Serialização direta via pydantic-core para listas grandes
+"""
+
+from typing import Any, Iterable, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def adapter_response(
+    adapter: TypeAdapter,
+    items: Iterable[Any],
+    *,
+    headers: Optional[Mapping[str, str]] = None,
+    **dump_kwargs,
+) -> Response:
+    """
+    Valida `items` (Rows, dicts ou ORM, via from_attributes) com um TypeAdapter pré-montado
+    e serializa direto para bytes JSON, sem o jsonable_encoder item a item do FastAPI.
+    O `response_model` da rota continua documentando o formato no OpenAPI.
+    """
+    content = adapter.dump_json(adapter.validate_python(items, from_attributes=True), **dump_kwargs)
+    return Response(content=content, media_type="application/json", headers=headers)
@@ -1,13 +1,22 @@
 """Core module - Configurações centrais."""
 
 from .database import engine, AsyncSessionLocal, Base, get_db, init_db, close_db
+from .cache import TTLCache
 from .security import (
     hash_password,
     verify_password,
+    hash_password_async,
+    verify_password_async,
+    verify_and_update_password_async,
+    calibrate_password_hashing,
+    shutdown_password_hashing,
+    HashingOverloadedError,
     create_access_token,
     decode_token,
+    token_cache_stats,
     SECRET_KEY,
     ALGORITHM,
+    TOKEN_PRINCIPAL_CLAIMS,
 )
 
 __all__ = [
@@ -19,8 +28,17 @@ __all__ = [
     "close_db",
     "hash_password",
     "verify_password",
+    "hash_password_async",
+    "verify_password_async",
+    "verify_and_update_password_async",
+    "calibrate_password_hashing",
+    "shutdown_password_hashing",
+    "HashingOverloadedError",
     "create_access_token",
     "decode_token",
+    "token_cache_stats",
     "SECRET_KEY",
     "ALGORITHM",
+    "TOKEN_PRINCIPAL_CLAIMS",
+    "TTLCache",
 ]
@@ -5,8 +5,11 @@ Database Configuration - SQLAlchemy 2.0 Async Setup
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from typing import AsyncGenerator
+from uuid import uuid4
 import os
 
+from app.core.metrics import InstrumentedAsyncQueuePool, install_sql_hooks
+
 # URL do banco de dados (PostgreSQL via Supabase)
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
@@ -17,16 +20,68 @@ DATABASE_URL = os.getenv(
 if DATABASE_URL.startswith("postgresql://"):
     DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
+# Pool da aplicação
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "0"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recicla conexões antes de timeouts de ociosidade do servidor/pooler (-1 desliga)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+
+def detect_connection_mode(url: str) -> str:
+    """
+    "direct" (Postgres) ou "transaction_pooler" (PgBouncer/Supavisor em modo transação).
+    DB_CONNECTION_MODE força o modo; sem ele, a porta 6543 ou um host *.pooler.* indicam pooler.
+    """
+    mode = os.getenv("DB_CONNECTION_MODE", "").strip().lower()
+    if mode in ("direct", "transaction_pooler"):
+        return mode
+    if mode in ("pooler", "pgbouncer", "transaction"):
+        return "transaction_pooler"
+    return "transaction_pooler" if ":6543/" in url or ".pooler." in url else "direct"
+
+
+def asyncpg_connect_args(mode: str) -> dict:
+    """
+    Direto: cache de prepared statements do asyncpg ligado (parse/plan uma vez por conexão).
+    Pooler em modo transação: cada transação pode cair em outra conexão do servidor,
+    então nada de cache e nomes únicos para os prepared statements (evita
+    "prepared statement ... already exists").
+    """
+    if mode == "direct":
+        return {"statement_cache_size": DB_STATEMENT_CACHE_SIZE}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4().hex}__",
+    }
+
+
+DB_CONNECTION_MODE = detect_connection_mode(DATABASE_URL)
+
+
+def build_engine(url: str = DATABASE_URL, mode: str = DB_CONNECTION_MODE, **overrides):
+    """Engine assíncrono com pool e connect_args do modo de conexão (também usado pelos benchmarks)."""
+    options = dict(
+        echo=False,
+        future=True,
+        pool_pre_ping=True,
+        # Mesmo AsyncAdaptedQueuePool padrão, medindo a espera por conexão (ver /metrics)
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        connect_args=asyncpg_connect_args(mode) if "postgresql" in url else {},
+    )
+    options.update(overrides)
+    return create_async_engine(url, **options)
+
+
 # Cria engine assíncrono
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=False,
-    future=True,
-    pool_pre_ping=True,
-    pool_size=20,
-    max_overflow=0,
-    connect_args={"statement_cache_size": 0} if "postgresql" in DATABASE_URL else {},
-)
+engine = build_engine()
+install_sql_hooks(engine)
 
 # Session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -0,0 +1,321 @@
+"""
+Metrics - Instrumentação por rota (latência, SQL, espera do pool) em texto Prometheus
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+import os
+import re
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+
+# Modo de depuração: fingerprint de cada statement e alerta de N+1 por requisição
+SQL_DEBUG = os.getenv("SQL_DEBUG", "false").lower() in ("1", "true", "yes")
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+# Statements mais lentos que isso são logados (0 desliga)
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_MS", "500")) / 1000
+
+# Buckets de latência em segundos (os padrões dos clientes Prometheus)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetrics:
+    """Acumulado de uma requisição; vive num ContextVar enquanto ela executa."""
+
+    __slots__ = ("scope", "statements", "db_time", "pool_wait", "fingerprints")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.fingerprints: Optional[Counter] = Counter() if SQL_DEBUG else None
+
+    @property
+    def route(self) -> str:
+        return route_template(self.scope) if self.scope is not None else "unmatched"
+
+    def n_plus_one_suspects(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """Formatos de statement repetidos `threshold` vezes ou mais nesta requisição."""
+        if not self.fingerprints:
+            return []
+        return [(shape, count) for shape, count in self.fingerprints.most_common() if count >= threshold]
+
+
+class RouteMetrics:
+    """Agregado por (método, rota): histograma de latência e totais de banco."""
+
+    __slots__ = (
+        "buckets", "count", "latency_sum", "statements", "db_time", "pool_wait",
+        "n_plus_one", "statuses",
+    )
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.latency_sum = 0.0
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.n_plus_one = 0
+        self.statuses: Dict[int, int] = {}
+
+
+current_request: ContextVar[Optional[RequestMetrics]] = ContextVar("current_request", default=None)
+
+# Tudo roda no event loop (os hooks do SQLAlchemy rodam no greenlet da própria task),
+# então os contadores não precisam de lock
+routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+# Última requisição concluída (usada pelos testes de orçamento de queries)
+last_request: Optional[RequestMetrics] = None
+
+
+def route_template(scope: dict) -> str:
+    """
+    Template completo da rota casada (ex.: /api/v1/quests/{quest_id}/complete).
+
+    scope["route"] traz o path da rota relativo ao APIRouter que a declarou (o FastAPI
+    recente inclui routers sem copiar as rotas com o prefixo). Os prefixos (mount/root_path
+    + routers) são os segmentos do path da requisição antes dos segmentos do template,
+    já que nenhum prefixo deste app tem parâmetros; com rotas já prefixadas o resultado é o mesmo.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+
+    path = scope.get("path", "")
+    root_path = scope.get("root_path", "")
+    if root_path and not path.startswith(root_path):
+        path = root_path + path
+
+    own_segments = template.strip("/").count("/") + 1 if template.strip("/") else 0
+    path_segments = path.rstrip("/").split("/")
+    prefix = "/".join(path_segments[: len(path_segments) - own_segments])
+    return prefix + template
+
+
+# Literais e placeholders viram "?", listas de "?" colapsam, espaços normalizam
+_FINGERPRINT_RULES = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\$\d+"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?, ...)"),
+    (re.compile(r"\(\?, \.\.\.\)(?:\s*,\s*\(\?, \.\.\.\))+"), "(?, ...), ..."),
+    (re.compile(r"\s+"), " "),
+)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Forma do statement sem valores: mesma forma = mesma consulta com parâmetros diferentes."""
+    for pattern, replacement in _FINGERPRINT_RULES:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def record_request(method: str, route: str, status: int, elapsed: float, request: RequestMetrics) -> None:
+    stats = routes.get((method, route))
+    if stats is None:
+        stats = routes[(method, route)] = RouteMetrics()
+    stats.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+    stats.count += 1
+    stats.latency_sum += elapsed
+    stats.statements += request.statements
+    stats.db_time += request.db_time
+    stats.pool_wait += request.pool_wait
+    stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    for shape, count in request.n_plus_one_suspects():
+        stats.n_plus_one += 1
+        print(f"⚠️  N+1 suspeito em {method} {route}: {count}x {shape}")
+
+
+# ============== SQLALCHEMY ==============
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if SLOW_QUERY_SECONDS or current_request.get() is not None:
+        conn.info.setdefault("query_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    request = current_request.get()
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = perf_counter() - starts.pop()
+
+    if SLOW_QUERY_SECONDS and elapsed >= SLOW_QUERY_SECONDS:
+        # Só o texto do statement (placeholders), nunca os valores dos parâmetros
+        where = request.route if request is not None else "background"
+        print(f"🐢 Query lenta ({elapsed * 1000:.0f}ms) em {where}: {fingerprint(statement)}")
+
+    if request is None:
+        return
+    request.db_time += elapsed
+    request.statements += 1
+    if request.fingerprints is not None:
+        request.fingerprints[fingerprint(statement)] += 1
+
+
+def _handle_error(exception_context):
+    # Statement que falhou não passa pelo after_cursor_execute: descarta o início
+    # empilhado, senão o próximo statement da conexão mede a partir dele
+    conn = exception_context.connection
+    if conn is None:
+        return
+    starts = conn.info.get("query_start")
+    if starts:
+        starts.pop()
+
+
+def install_sql_hooks(engine) -> None:
+    """Registra os hooks de cursor no engine (síncrono por baixo do AsyncEngine)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool padrão do engine assíncrono, medindo quanto cada checkout espera
+    (fila do pool + eventual conexão nova / pre-ping).
+    """
+
+    def connect(self):
+        request = current_request.get()
+        if request is None:
+            return super().connect()
+        start = perf_counter()
+        try:
+            return super().connect()
+        finally:
+            request.pool_wait += perf_counter() - start
+
+
+# ============== ASGI ==============
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI puro (sem BaseHTTPMiddleware): mede a requisição, agrega por
+    template de rota e anexa o header Server-Timing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestMetrics(scope)
+        token = current_request.set(request)
+        start = perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if METRICS_SERVER_TIMING:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", _server_timing(request, perf_counter() - start)),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            global last_request
+            current_request.reset(token)
+            last_request = request
+            record_request(scope["method"], request.route, status, perf_counter() - start, request)
+
+
+def _server_timing(request: RequestMetrics, elapsed: float) -> bytes:
+    return (
+        f'db;dur={request.db_time * 1000:.2f};desc="{request.statements} queries", '
+        f"pool;dur={request.pool_wait * 1000:.2f}, "
+        f"app;dur={elapsed * 1000:.2f}"
+    ).encode()
+
+
+# ============== PROMETHEUS ==============
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(method: str, route: str, **extra) -> str:
+    pairs = {"method": method, "route": route, **extra}
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in pairs.items())
+
+
+def render_prometheus(pool=None, caches: Optional[Dict[str, dict]] = None) -> str:
+    """
+    Formato de exposição texto do Prometheus (version 0.0.4).
+    `caches` mapeia nome -> TTLCache.stats() dos caches em memória (tokens, principals).
+    """
+    lines: List[str] = [
+        "# HELP life_http_request_duration_seconds Latência das requisições por rota.",
+        "# TYPE life_http_request_duration_seconds histogram",
+    ]
+    for (method, route), stats in sorted(routes.items()):
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), stats.buckets):
+            cumulative += count
+            lines.append(
+                f"life_http_request_duration_seconds_bucket{{{_labels(method, route, le=bound)}}} {cumulative}"
+            )
+        lines.append(f"life_http_request_duration_seconds_sum{{{_labels(method, route)}}} {stats.latency_sum}")
+        lines.append(f"life_http_request_duration_seconds_count{{{_labels(method, route)}}} {stats.count}")
+
+    counters = (
+        ("life_http_requests_total", "Requisições por rota e status.", None),
+        ("life_db_statements_total", "Statements SQL executados por rota.", "statements"),
+        ("life_db_time_seconds_total", "Tempo gasto em SQL por rota.", "db_time"),
+        ("life_db_pool_wait_seconds_total", "Espera por conexão do pool por rota.", "pool_wait"),
+        ("life_db_n_plus_one_suspects_total", "Suspeitas de N+1 por rota (SQL_DEBUG).", "n_plus_one"),
+    )
+    for name, help_text, attribute in counters:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for (method, route), stats in sorted(routes.items()):
+            if attribute is None:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f"{name}{{{_labels(method, route, status=status)}}} {count}")
+            else:
+                lines.append(f"{name}{{{_labels(method, route)}}} {getattr(stats, attribute)}")
+
+    if pool is not None and hasattr(pool, "checkedout"):
+        lines.append("# HELP life_db_pool_checked_out Conexões do pool em uso.")
+        lines.append("# TYPE life_db_pool_checked_out gauge")
+        lines.append(f"life_db_pool_checked_out {pool.checkedout()}")
+
+    if caches:
+        cache_metrics = (
+            ("life_cache_hits_total", "Hits por cache em memória.", "counter", "hits"),
+            ("life_cache_misses_total", "Misses por cache em memória.", "counter", "misses"),
+            ("life_cache_entries", "Entradas por cache em memória.", "gauge", "size"),
+        )
+        for name, help_text, kind, key in cache_metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for cache, stats in sorted(caches.items()):
+                lines.append(f'{name}{{cache="{_escape(cache)}"}} {stats[key]}')
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,71 @@
+"""
+Pagination - Cursores opacos para paginação keyset em (date, id)
+
+Colunas de data anuláveis ordenam por coalesce(date, '-infinity'): linhas sem data
+vêm por último numa listagem DESC e continuam alcançáveis pelo cursor (date null).
+Colunas NOT NULL usam a coluna direto, casando com os índices (user_id, date DESC, id DESC).
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, Tuple
+import base64
+import json
+
+from sqlalchemy import func, literal_column, tuple_
+
+# Posição de uma data NULL: antes de qualquer timestamp
+NULL_DATE = literal_column("'-infinity'::timestamp")
+
+
+def encode_cursor(date: Optional[datetime], id: int) -> str:
+    """Codifica a posição (date, id) do último item da página num cursor opaco."""
+    raw = json.dumps([date.isoformat() if date is not None else None, id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Decodifica um cursor; levanta ValueError se estiver malformado."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date, id = json.loads(base64.urlsafe_b64decode(padded))
+        return (datetime.fromisoformat(date) if date is not None else None), int(id)
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise ValueError("Cursor inválido")
+
+
+def sort_key(date_column):
+    """Expressão de ordenação da data: a própria coluna, ou coalesce se ela aceita NULL."""
+    if getattr(date_column, "nullable", False):
+        return func.coalesce(date_column, NULL_DATE)
+    return date_column
+
+
+def apply_keyset(stmt, date_column, id_column, *, cursor: Optional[str], skip: int, limit: int):
+    """
+    Ordena por (date DESC, id DESC) e posiciona após o cursor.
+    Sem cursor, `skip` continua funcionando como OFFSET (compatibilidade).
+    Busca limit + 1 linhas para saber se existe próxima página.
+    """
+    date_key = sort_key(date_column)
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        cursor_key = cursor_date if cursor_date is not None else NULL_DATE
+        stmt = stmt.where(tuple_(date_key, id_column) < tuple_(cursor_key, cursor_id))
+    elif skip:
+        stmt = stmt.offset(skip)
+
+    return stmt.order_by(date_key.desc(), id_column.desc()).limit(limit + 1)
+
+
+def split_page(
+    rows: Sequence,
+    limit: int,
+    key: Callable[[Any], Tuple[Optional[datetime], int]] = lambda row: (row.date, row.id),
+) -> Tuple[list, Optional[str]]:
+    """Separa a linha extra (sentinela) e gera o next_cursor a partir do último item."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    return page, encode_cursor(*key(page[-1]))
@@ -2,20 +2,50 @@
 Security Configuration - JWT, Password Hashing, etc
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+import asyncio
+import hashlib
+import math
 import os
+import time
+
+from app.core.cache import TTLCache
 
 # Configurações
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "10080"))  # 7 dias
+# Se ativo, o token carrega `username` e `is_active` e a autenticação não consulta o banco
+TOKEN_PRINCIPAL_CLAIMS = os.getenv("TOKEN_PRINCIPAL_CLAIMS", "false").lower() in ("1", "true", "yes")
+
+# Cache de tokens já verificados (evita refazer o HMAC a cada request)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+# Hashing de senha fora do event loop
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "32"))  # pedidos aguardando além do pool
+BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", "250"))
+BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", "10"))
+BCRYPT_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", "14"))
+BCRYPT_ROUNDS = os.getenv("BCRYPT_ROUNDS")  # se definido, pula a calibração
 
 # Context para hash de senha
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+# bcrypt libera o GIL, então threads bastam para tirar o custo do event loop
+_hash_executor = ThreadPoolExecutor(max_workers=HASH_POOL_SIZE, thread_name_prefix="bcrypt")
+_hash_pending = 0
+
+
+class HashingOverloadedError(RuntimeError):
+    """Fila de hashing cheia; o pedido deve ser rejeitado (503)."""
+
 
 def hash_password(password: str) -> str:
     """Hash uma senha usando bcrypt."""
@@ -27,6 +57,72 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def _run_in_hash_pool(func, *args):
+    """Executa `func` no pool de hashing, rejeitando se a fila estiver cheia."""
+    global _hash_pending
+    if _hash_pending >= HASH_POOL_SIZE + HASH_QUEUE_LIMIT:
+        raise HashingOverloadedError("Servidor ocupado, tente novamente")
+    
+    _hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """Versão assíncrona de hash_password (roda no pool de hashing)."""
+    return await _run_in_hash_pool(pwd_context.hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Versão assíncrona de verify_password (roda no pool de hashing)."""
+    return await _run_in_hash_pool(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """
+    Verifica a senha e, se o hash estiver desatualizado (pwd_context.needs_update),
+    retorna também o novo hash a ser persistido.
+    """
+    return await _run_in_hash_pool(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+def calibrate_bcrypt_rounds(target_ms: float = BCRYPT_TARGET_MS) -> int:
+    """
+    Escolhe o custo do bcrypt mais próximo (sem exceder) da latência alvo.
+    Cada round a mais dobra o custo, então basta medir um custo baixo e extrapolar.
+    """
+    if BCRYPT_ROUNDS:
+        rounds = int(BCRYPT_ROUNDS)
+    else:
+        probe_rounds = 8
+        probe = pwd_context.handler("bcrypt").using(rounds=probe_rounds)
+        start = time.perf_counter()
+        probe.hash("calibration")
+        elapsed_ms = max((time.perf_counter() - start) * 1000, 0.001)
+        rounds = probe_rounds + math.floor(math.log2(target_ms / elapsed_ms))
+    
+    rounds = max(BCRYPT_MIN_ROUNDS, min(BCRYPT_MAX_ROUNDS, rounds))
+    # min_rounds faz needs_update marcar hashes mais fracos para rehash no login
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+    return rounds
+
+
+async def calibrate_password_hashing() -> int:
+    """Calibra o bcrypt no pool de hashing (chamado no startup)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, calibrate_bcrypt_rounds)
+
+
+def shutdown_password_hashing() -> None:
+    """Encerra o pool de hashing."""
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Cria um token JWT."""
     to_encode = data.copy()
@@ -36,15 +132,33 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    # `iat` fracionário: permite comparar com alterações do usuário no mesmo segundo
+    to_encode.update({"exp": expire, "iat": time.time()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def decode_token(token: str) -> Optional[dict]:
-    """Decodifica um token JWT."""
+    """
+    Decodifica um token JWT.
+    Claims já verificadas ficam em cache (chave = sha256 do token) até o `exp` do próprio token.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(key, payload, ttl=exp - time.time())
+    return dict(payload)
+
+
+def token_cache_stats() -> dict:
+    """Hits/misses do cache de tokens verificados (exposto em /metrics)."""
+    return token_cache.stats()
@@ -1,2 +1,4 @@
 from .crud_finance import finance
 from .crud_body import body
+from .crud_quest import quest
+from .crud_stats import stats
@@ -1,32 +1,162 @@
-from typing import List
+from datetime import datetime
+from typing import AsyncIterator, List, Mapping, Optional, Sequence, Tuple
+from sqlalchemy import literal_column, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.core.pagination import apply_keyset, split_page
 from app.models.models import BodyMetric
 from app.schemas.body import BodyMetricCreate
 
+EXPORT_COLUMNS = ("id", "date", "weight", "muscle_mass", "fat_percentage", "photo_url", "created_at")
+
+# Columns overwritten when a reading for the same (user_id, date) already exists
+UPSERT_COLUMNS = ("weight", "muscle_mass", "fat_percentage", "photo_url")
+
+# 6 bind parameters per row; stays far below asyncpg's 32767 per statement
+UPSERT_BATCH_SIZE = 1000
+
 class CRUDBody:
     async def get_multi_by_owner(
         self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100
-    ) -> List[BodyMetric]:
-        result = await db.execute(
-            select(BodyMetric)
-            .where(BodyMetric.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
-            .order_by(BodyMetric.date.desc())
+    ) -> List[Row]:
+        metrics, _ = await self.get_page_by_owner(
+            db, user_id=user_id, skip=skip, limit=limit
+        )
+        return metrics
+
+    async def get_page_by_owner(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> Tuple[List[Row], Optional[str]]:
+        """
+        Keyset pagination on (date, id), served by ix_body_metrics_user_date.
+        Returns the page and the cursor for the next one (None on the last page).
+        """
+        # Plain rows: no identity-map bookkeeping on the hot listing path
+        stmt = select(*BodyMetric.__table__.columns).where(BodyMetric.user_id == user_id)
+        if date_from is not None:
+            stmt = stmt.where(BodyMetric.date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(BodyMetric.date < date_to)
+
+        stmt = apply_keyset(
+            stmt, BodyMetric.date, BodyMetric.id,
+            cursor=cursor, skip=skip, limit=limit,
+        )
+        result = await db.execute(stmt)
+        return split_page(result.all(), limit)
+
+    async def get_series(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        columns: Sequence[str],
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> List[tuple]:
+        """(date, *columns) tuples ordered by date, without building ORM objects."""
+        stmt = select(BodyMetric.date, *(BodyMetric.__table__.c[name] for name in columns)).where(
+            BodyMetric.user_id == user_id
+        )
+        if date_from is not None:
+            stmt = stmt.where(BodyMetric.date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(BodyMetric.date < date_to)
+
+        result = await db.execute(stmt.order_by(BodyMetric.date, BodyMetric.id))
+        return [tuple(row) for row in result]
+
+    async def stream_by_owner(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[List[Mapping]]:
+        """
+        Full history, oldest first, in batches of `yield_per` rows read from a
+        server-side cursor, so memory does not grow with the size of the history.
+        """
+        stmt = select(*(BodyMetric.__table__.c[name] for name in EXPORT_COLUMNS)).where(
+            BodyMetric.user_id == user_id
+        )
+        if date_from is not None:
+            stmt = stmt.where(BodyMetric.date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(BodyMetric.date < date_to)
+
+        result = await db.stream(
+            stmt.order_by(BodyMetric.date, BodyMetric.id)
+            .execution_options(yield_per=yield_per)
+        )
+        async for partition in result.mappings().partitions():
+            yield partition
+
+    def _upsert(self, rows: List[dict], *, only_changed: bool):
+        stmt = pg_insert(BodyMetric).values(rows)
+        set_ = {name: stmt.excluded[name] for name in UPSERT_COLUMNS}
+        where = None
+        if only_changed:
+            # Re-importing identical readings touches no rows (no dead tuples, no WAL)
+            where = tuple_(*(BodyMetric.__table__.c[name] for name in UPSERT_COLUMNS)).is_distinct_from(
+                tuple_(*(stmt.excluded[name] for name in UPSERT_COLUMNS))
+            )
+        return stmt.on_conflict_do_update(
+            constraint="uq_body_metrics_user_date", set_=set_, where=where
         )
-        return result.scalars().all()
 
     async def create(
         self, db: AsyncSession, *, obj_in: BodyMetricCreate, user_id: int
     ) -> BodyMetric:
-        db_obj = BodyMetric(
-            **obj_in.dict(),
-            user_id=user_id
+        """Insert a reading, or replace the one already stored for the same date."""
+        stmt = self._upsert([{**obj_in.dict(), "user_id": user_id}], only_changed=False)
+        result = await db.execute(
+            select(BodyMetric).from_statement(stmt.returning(BodyMetric))
         )
-        db.add(db_obj)
+        db_obj = result.scalar_one()
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
+    async def upsert_bulk(
+        self, db: AsyncSession, *, objs_in: Sequence[BodyMetricCreate], user_id: int
+    ) -> dict:
+        """
+        Upsert readings on (user_id, date) in batches of UPSERT_BATCH_SIZE, in one transaction.
+        Later readings in the payload win over earlier ones with the same date.
+        Returns how many rows were inserted, updated and left unchanged.
+        """
+        by_date = {obj_in.date: {**obj_in.dict(), "user_id": user_id} for obj_in in objs_in}
+        rows = list(by_date.values())
+
+        inserted = updated = 0
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            stmt = self._upsert(rows[start:start + UPSERT_BATCH_SIZE], only_changed=True)
+            # xmax = 0 only for freshly inserted tuples
+            result = await db.execute(stmt.returning(literal_column("xmax = 0")))
+            for (was_inserted,) in result:
+                if was_inserted:
+                    inserted += 1
+                else:
+                    updated += 1
+        await db.commit()
+
+        return {
+            "received": len(objs_in),
+            "inserted": inserted,
+            "updated": updated,
+            "unchanged": len(rows) - inserted - updated,
+        }
+
 body = CRUDBody()
@@ -1,21 +1,94 @@
-from typing import List
+from collections import defaultdict
+from datetime import date, datetime
+from typing import AsyncIterator, List, Mapping, Optional, Tuple
+from sqlalchemy import Date, cast, delete, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.models.models import FinanceTransaction
+from sqlalchemy.sql import func
+from app.core.pagination import apply_keyset, split_page
+from app.models.models import FinanceMonthlyRollup, FinanceTransaction, FinanceTypeEnum
 from app.schemas.finance import FinanceTransactionCreate
 
+EXPORT_COLUMNS = ("id", "date", "type", "amount", "category", "description", "is_fixed", "created_at")
+
+
+def month_start(value: date) -> date:
+    """First day of the month containing `value` (the rollup key)."""
+    return date(value.year, value.month, 1)
+
 class CRUDFinance:
     async def get_multi_by_owner(
         self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 100
-    ) -> List[FinanceTransaction]:
-        result = await db.execute(
-            select(FinanceTransaction)
-            .where(FinanceTransaction.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
-            .order_by(FinanceTransaction.date.desc())
+    ) -> List[Row]:
+        transactions, _ = await self.get_page_by_owner(
+            db, user_id=user_id, skip=skip, limit=limit
+        )
+        return transactions
+
+    async def get_page_by_owner(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        type: Optional[FinanceTypeEnum] = None,
+        category: Optional[str] = None,
+    ) -> Tuple[List[Row], Optional[str]]:
+        """
+        Keyset pagination on (date, id), served by ix_finance_transactions_user_date.
+        Returns the page and the cursor for the next one (None on the last page).
+        """
+        # Plain rows: no identity-map bookkeeping on the hot listing path
+        stmt = select(*FinanceTransaction.__table__.columns).where(FinanceTransaction.user_id == user_id)
+        if date_from is not None:
+            stmt = stmt.where(FinanceTransaction.date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(FinanceTransaction.date < date_to)
+        if type is not None:
+            stmt = stmt.where(FinanceTransaction.type == type)
+        if category is not None:
+            stmt = stmt.where(FinanceTransaction.category == category)
+
+        stmt = apply_keyset(
+            stmt, FinanceTransaction.date, FinanceTransaction.id,
+            cursor=cursor, skip=skip, limit=limit,
         )
-        return result.scalars().all()
+        result = await db.execute(stmt)
+        return split_page(result.all(), limit)
+
+    async def stream_by_owner(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[List[Mapping]]:
+        """
+        Full history, oldest first, in batches of `yield_per` rows read from a
+        server-side cursor, so memory does not grow with the size of the history.
+        """
+        stmt = select(*(FinanceTransaction.__table__.c[name] for name in EXPORT_COLUMNS)).where(
+            FinanceTransaction.user_id == user_id
+        )
+        if date_from is not None:
+            stmt = stmt.where(FinanceTransaction.date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(FinanceTransaction.date < date_to)
+
+        result = await db.stream(
+            stmt.order_by(FinanceTransaction.date, FinanceTransaction.id)
+            .execution_options(yield_per=yield_per)
+        )
+        async for partition in result.mappings().partitions():
+            yield partition
 
     async def create(
         self, db: AsyncSession, *, obj_in: FinanceTransactionCreate, user_id: int
@@ -25,8 +98,116 @@ class CRUDFinance:
             user_id=user_id
         )
         db.add(db_obj)
+        await db.flush()
+        # Same transaction as the insert, so the rollup never drifts from the rows
+        await self._add_to_rollup(db, db_obj)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
+    async def _add_to_rollup(self, db: AsyncSession, db_obj: FinanceTransaction) -> None:
+        stmt = pg_insert(FinanceMonthlyRollup).values(
+            user_id=db_obj.user_id,
+            month=month_start(db_obj.date),
+            type=db_obj.type,
+            category=db_obj.category,
+            total=db_obj.amount,
+            transactions=1,
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    FinanceMonthlyRollup.user_id,
+                    FinanceMonthlyRollup.month,
+                    FinanceMonthlyRollup.type,
+                    FinanceMonthlyRollup.category,
+                ],
+                set_={
+                    "total": FinanceMonthlyRollup.total + stmt.excluded.total,
+                    "transactions": FinanceMonthlyRollup.transactions + 1,
+                },
+            )
+        )
+
+    async def get_summary(
+        self, db: AsyncSession, *, user_id: int, month_from: date, month_to: date
+    ) -> dict:
+        """
+        Income, expense and balance per month and per category for [month_from, month_to].
+        Reads only the rollup, so the cost depends on months x categories,
+        not on how many transactions the user has.
+        """
+        result = await db.execute(
+            select(FinanceMonthlyRollup)
+            .where(
+                FinanceMonthlyRollup.user_id == user_id,
+                FinanceMonthlyRollup.month >= month_start(month_from),
+                FinanceMonthlyRollup.month <= month_start(month_to),
+            )
+            .order_by(FinanceMonthlyRollup.month)
+        )
+
+        months = {}
+        categories = defaultdict(lambda: {"total": 0.0, "transactions": 0})
+        for row in result.scalars():
+            month = months.setdefault(row.month, {"month": row.month, "income": 0.0, "expense": 0.0})
+            total = float(row.total)
+            month["income" if row.type == FinanceTypeEnum.INCOME else "expense"] += total
+
+            category = categories[(row.type, row.category)]
+            category["total"] += total
+            category["transactions"] += row.transactions
+
+        for month in months.values():
+            month["balance"] = month["income"] - month["expense"]
+
+        income = sum(month["income"] for month in months.values())
+        expense = sum(month["expense"] for month in months.values())
+        return {
+            "month_from": month_start(month_from),
+            "month_to": month_start(month_to),
+            "income": income,
+            "expense": expense,
+            "balance": income - expense,
+            "months": list(months.values()),
+            "categories": sorted(
+                (
+                    {"type": type, "category": category, **totals}
+                    for (type, category), totals in categories.items()
+                ),
+                key=lambda item: -item["total"],
+            ),
+        }
+
+    async def rebuild_rollup(self, db: AsyncSession, *, user_id: Optional[int] = None) -> int:
+        """
+        Recompute the rollup from finance_transactions (all users, or just one).
+        Returns the number of rollup rows written.
+        """
+        month = cast(func.date_trunc("month", FinanceTransaction.date), Date)
+        source = (
+            select(
+                FinanceTransaction.user_id,
+                month,
+                FinanceTransaction.type,
+                FinanceTransaction.category,
+                func.sum(FinanceTransaction.amount),
+                func.count(),
+            )
+            .group_by(FinanceTransaction.user_id, month, FinanceTransaction.type, FinanceTransaction.category)
+        )
+        clear = delete(FinanceMonthlyRollup)
+        if user_id is not None:
+            source = source.where(FinanceTransaction.user_id == user_id)
+            clear = clear.where(FinanceMonthlyRollup.user_id == user_id)
+
+        await db.execute(clear)
+        result = await db.execute(
+            insert(FinanceMonthlyRollup).from_select(
+                ["user_id", "month", "type", "category", "total", "transactions"], source
+            )
+        )
+        await db.commit()
+        return result.rowcount
+
 finance = CRUDFinance()
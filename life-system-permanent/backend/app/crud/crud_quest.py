@@ -0,0 +1,181 @@
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+import json
+from sqlalchemy import insert, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+from app.core.pagination import apply_keyset, split_page
+from app.models.models import (
+    Quest,
+    QuestDifficultyEnum,
+    QuestCategoryEnum,
+    QuestStatusEnum,
+    AttributeRewardEnum,
+)
+from app.schemas import QuestCreate
+
+# Acima disso o INSERT multi-linha vira COPY (asyncpg limita 32767 parâmetros por statement)
+COPY_THRESHOLD = 1000
+
+QUEST_COPY_COLUMNS = [
+    "user_id",
+    "title",
+    "description",
+    "difficulty",
+    "category",
+    "xp_reward",
+    "attribute_reward",
+    "penalty_hp",
+    "is_healing",
+    "status",
+    "is_completed",
+    "due_date",
+]
+
+
+# Colunas que podem ser pedidas via `fields=` na listagem
+QUEST_FIELDS = {column.name for column in Quest.__table__.columns}
+
+
+class CRUDQuest:
+    def _active_filters(
+        self,
+        *,
+        user_id: int,
+        category: Optional[QuestCategoryEnum] = None,
+        difficulty: Optional[QuestDifficultyEnum] = None,
+        status: Optional[QuestStatusEnum] = None,
+        due_from: Optional[datetime] = None,
+        due_to: Optional[datetime] = None,
+    ) -> list:
+        """Condições da listagem de quests ativas (prefixo do ix_quests_user_open_created)."""
+        conditions = [Quest.user_id == user_id, Quest.is_completed == False]
+        if category is not None:
+            conditions.append(Quest.category == category)
+        if difficulty is not None:
+            conditions.append(Quest.difficulty == difficulty)
+        if status is not None:
+            conditions.append(Quest.status == status)
+        if due_from is not None:
+            conditions.append(Quest.due_date >= due_from)
+        if due_to is not None:
+            conditions.append(Quest.due_date < due_to)
+        return conditions
+
+    async def get_active_page(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        fields: Optional[Sequence[str]] = None,
+        **filters,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Página de quests ativas, mais recentes primeiro, com cursor em (created_at, id).
+        Com `fields`, o SELECT carrega só essas colunas (id e created_at sempre vêm
+        para montar o cursor, mas só são devolvidos se pedidos).
+        """
+        if fields:
+            unknown = set(fields) - QUEST_FIELDS
+            if unknown:
+                raise ValueError(f"Campos inválidos: {', '.join(sorted(unknown))}")
+            columns = [Quest.__table__.c[name] for name in dict.fromkeys([*fields, "id", "created_at"])]
+        else:
+            columns = list(Quest.__table__.columns)
+
+        stmt = select(*columns).where(*self._active_filters(user_id=user_id, **filters))
+        stmt = apply_keyset(
+            stmt, Quest.created_at, Quest.id, cursor=cursor, skip=0, limit=limit
+        )
+        result = await db.execute(stmt)
+        rows, next_cursor = split_page(
+            result.mappings().all(), limit, key=lambda row: (row["created_at"], row["id"])
+        )
+
+        if fields:
+            return [{name: row[name] for name in fields} for row in rows], next_cursor
+        return [dict(row) for row in rows], next_cursor
+
+    async def count_active(
+        self, db: AsyncSession, *, user_id: int, estimate: bool = False, **filters
+    ) -> int:
+        """
+        Total de quests ativas com os filtros dados.
+        `estimate=True` usa a estimativa de linhas do planner (EXPLAIN) em vez de COUNT(*).
+        """
+        conditions = self._active_filters(user_id=user_id, **filters)
+        if not estimate:
+            result = await db.execute(select(func.count()).select_from(Quest).where(*conditions))
+            return result.scalar_one()
+
+        stmt = select(Quest.id).where(*conditions)
+        sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        # Escapa ':' dos literais (ex.: horários) para o text() não tratá-los como bind params
+        result = await db.execute(text("EXPLAIN (FORMAT JSON) " + sql.replace(":", "\\:")))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _row(self, obj_in: QuestCreate, user_id: int) -> dict:
+        """Linha completa (com os defaults do modelo), usada tanto no INSERT quanto no COPY."""
+        return {
+            "user_id": user_id,
+            "title": obj_in.title,
+            "description": obj_in.description,
+            "difficulty": QuestDifficultyEnum(obj_in.difficulty.value),
+            "category": QuestCategoryEnum.SIDE_QUEST,
+            "xp_reward": obj_in.xp_reward,
+            "attribute_reward": (
+                AttributeRewardEnum(obj_in.attribute_reward.value)
+                if obj_in.attribute_reward else None
+            ),
+            "penalty_hp": 0,
+            "is_healing": False,
+            "status": QuestStatusEnum.AVAILABLE,
+            "is_completed": False,
+            "due_date": obj_in.due_date,
+        }
+
+    async def create_bulk(
+        self, db: AsyncSession, *, objs_in: Sequence[QuestCreate], user_id: int
+    ) -> List[dict]:
+        """Insere todas as quests num único INSERT ... VALUES (...), (...) RETURNING."""
+        rows = [self._row(obj_in, user_id) for obj_in in objs_in]
+        result = await db.execute(
+            insert(Quest).values(rows).returning(*Quest.__table__.columns)
+        )
+        created = [dict(row) for row in result.mappings()]
+        await db.commit()
+        return created
+
+    async def copy_bulk(
+        self, db: AsyncSession, *, objs_in: Sequence[QuestCreate], user_id: int
+    ) -> int:
+        """
+        Ingestão via COPY (asyncpg copy_records_to_table) para lotes grandes.
+        Não retorna as linhas criadas, apenas a quantidade.
+        """
+        records = []
+        for obj_in in objs_in:
+            row = self._row(obj_in, user_id)
+            # Enums nativos do Postgres guardam o nome do membro (como o SQLAlchemy faz)
+            for column in ("difficulty", "category", "status", "attribute_reward"):
+                if row[column] is not None:
+                    row[column] = row[column].name
+            records.append(tuple(row[column] for column in QUEST_COPY_COLUMNS))
+
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            Quest.__tablename__, records=records, columns=QUEST_COPY_COLUMNS
+        )
+        await db.commit()
+        return len(records)
+
+
+quest = CRUDQuest()
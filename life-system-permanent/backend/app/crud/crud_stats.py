@@ -0,0 +1,35 @@
+from typing import Optional
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.models.models import PlayerStats
+
+class CRUDStats:
+    async def get_by_owner(self, db: AsyncSession, *, user_id: int) -> Optional[Row]:
+        """Player stats as a plain row (no ORM instance), or None."""
+        result = await db.execute(
+            select(*PlayerStats.__table__.columns).where(PlayerStats.user_id == user_id)
+        )
+        return result.first()
+
+    async def get_or_create_by_owner(self, db: AsyncSession, *, user_id: int) -> Row:
+        """
+        Player stats, creating the default row when missing (it should exist since
+        registration). ON CONFLICT DO NOTHING keeps concurrent first calls safe.
+        """
+        stats = await self.get_by_owner(db, user_id=user_id)
+        if stats is not None:
+            return stats
+
+        result = await db.execute(
+            pg_insert(PlayerStats)
+            .values(user_id=user_id)
+            .on_conflict_do_nothing(index_elements=[PlayerStats.user_id])
+            .returning(*PlayerStats.__table__.columns)
+        )
+        stats = result.first()
+        await db.commit()
+        return stats if stats is not None else await self.get_by_owner(db, user_id=user_id)
+
+stats = CRUDStats()
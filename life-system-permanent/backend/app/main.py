@@ -4,10 +4,13 @@ Main Application - FastAPI App Setup
 
 import os
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.core import init_db, close_db
+from app.core import engine, init_db, close_db, calibrate_password_hashing, shutdown_password_hashing, token_cache_stats
+from app.core.metrics import MetricsMiddleware, render_prometheus
 from app.api.v1.api import api_router
+from app.services import AuthService, PunishmentService, RankService
 
 # Cria aplicação FastAPI
 app = FastAPI(
@@ -33,9 +36,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paginação keyset (GET /finance/, /body/, /quests)
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "Server-Timing"],
 )
 # -------------------------------------
 
+# Latência, SQL e espera do pool por rota (GET /metrics + header Server-Timing)
+app.add_middleware(MetricsMiddleware)
+
 # Eventos de startup e shutdown
 @app.on_event("startup")
 async def startup_event():
@@ -43,6 +51,14 @@ async def startup_event():
     await init_db()
     print("✅ Banco de dados inicializado")
     
+    rounds = await calibrate_password_hashing()
+    print(f"🔐 bcrypt calibrado: {rounds} rounds")
+    
+    app.state.rank_rebuilder = RankService.start_rebuilder()
+    app.state.punishment_sweeper = PunishmentService.start_sweeper()
+    if app.state.punishment_sweeper:
+        print("⏱️  Sweeper de punição agendado")
+    
     # DEBUG: Lista todas as rotas para garantir que /register existe
     print("🔍 Rotas carregadas:")
     for route in app.routes:
@@ -53,7 +69,12 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Fecha conexões ao desligar."""
+    for task_name in ("punishment_sweeper", "rank_rebuilder"):
+        task = getattr(app.state, task_name, None)
+        if task:
+            task.cancel()
     await close_db()
+    shutdown_password_hashing()
     print("❌ Conexões fechadas")
 
 
@@ -68,6 +89,16 @@ async def health_check():
     return {"status": "ok", "message": "Life System API is running"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métricas por rota no formato texto do Prometheus."""
+    caches = {"token": token_cache_stats(), "principal": AuthService.principal_cache_stats()}
+    return PlainTextResponse(
+        render_prometheus(engine.sync_engine.pool, caches=caches),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @app.get("/")
 async def root():
     """Rota raiz."""
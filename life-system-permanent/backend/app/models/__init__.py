@@ -5,6 +5,7 @@ from .models import (
     PlayerStats,
     Quest,
     FinanceTransaction,
+    FinanceMonthlyRollup,
     BodyMetric,
     QuestDifficultyEnum,
     AttributeRewardEnum,
@@ -18,6 +19,7 @@ __all__ = [
     "PlayerStats",
     "Quest",
     "FinanceTransaction",
+    "FinanceMonthlyRollup",
     "BodyMetric",
     "QuestDifficultyEnum",
     "AttributeRewardEnum",
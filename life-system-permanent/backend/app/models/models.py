@@ -2,7 +2,7 @@
 SQLAlchemy Models - Definição das tabelas do banco de dados
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Enum, Text, Numeric
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Boolean, ForeignKey, Enum, Text, Numeric, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -110,7 +110,8 @@ class Quest(Base):
     due_date = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     
-    created_at = Column(DateTime, server_default=func.now())
+    # NOT NULL: a listagem pagina por (created_at, id)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
@@ -145,9 +146,27 @@ class FinanceTransaction(Base):
     user = relationship("User", back_populates="finance_transactions")
 
 
+class FinanceMonthlyRollup(Base):
+    """
+    Totais mensais por (usuário, mês, tipo, categoria).
+    Mantido incrementalmente por CRUDFinance.create; reconstruível a partir do histórico.
+    """
+    __tablename__ = "finance_monthly_rollup"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True, comment="Primeiro dia do mês")
+    type = Column(Enum(FinanceTypeEnum), primary_key=True)
+    category = Column(String(100), primary_key=True)
+    
+    total = Column(Numeric(14, 2), nullable=False, default=0)
+    transactions = Column(Integer, nullable=False, default=0)
+
+
 class BodyMetric(Base):
     """Modelo de métricas corporais (Solo Leveling Growth)."""
     __tablename__ = "body_metrics"
+    # Uma medição por instante: alvo do upsert em lote (ver migration e1c9a4b7d3f6)
+    __table_args__ = (UniqueConstraint("user_id", "date", name="uq_body_metrics_user_date"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -163,8 +182,22 @@ class BodyMetric(Base):
     # Relationships
     user = relationship("User", back_populates="body_metrics")
 
-# Punishment System Logic (Plan):
-# A background task (Celery/APScheduler) or a check on User Login will:
+# Índices dos acessos quentes por usuário (ver migration c4e1a7d2b9f3)
+Index("ix_quests_user_open_created", Quest.user_id, Quest.is_completed, Quest.created_at.desc())
+Index(
+    "ix_quests_open_daily_due",
+    Quest.due_date,
+    postgresql_where=text(
+        "category = 'DAILY' AND status IS DISTINCT FROM 'COMPLETED' "
+        "AND status IS DISTINCT FROM 'FAILED'"
+    ),
+)
+Index("ix_finance_transactions_user_date", FinanceTransaction.user_id, FinanceTransaction.date.desc(), FinanceTransaction.id.desc())
+Index("ix_body_metrics_user_date", BodyMetric.user_id, BodyMetric.date.desc(), BodyMetric.id.desc())
+
+# Punishment System Logic:
+# Implemented set-based in app/services/punishment_service.py, run by an asyncio
+# sweeper started on app startup (and per user by POST /quests/check-dailies):
 # 1. Query all 'DAILY' quests where due_date < now() AND status != COMPLETED.
 # 2. For each missed quest, deduct 'penalty_hp' from User.player_stats.hp.
 # 3. If HP <= 0, trigger 'Death' state (level down or xp loss).
@@ -8,7 +8,12 @@ from .schemas import (
     PlayerStatsResponse,
     QuestCreate,
     QuestResponse,
+    QuestListItem,
     QuestCompleteResponse,
+    QuestBulkCreateResponse,
+    QuestBatchCompleteRequest,
+    QuestBatchItemResult,
+    QuestBatchCompleteResponse,
     QuestDifficultyEnum,
     AttributeRewardEnum,
     FinanceLogCreate,
@@ -23,7 +28,12 @@ __all__ = [
     "PlayerStatsResponse",
     "QuestCreate",
     "QuestResponse",
+    "QuestListItem",
     "QuestCompleteResponse",
+    "QuestBulkCreateResponse",
+    "QuestBatchCompleteRequest",
+    "QuestBatchItemResult",
+    "QuestBatchCompleteResponse",
     "QuestDifficultyEnum",
     "AttributeRewardEnum",
     "FinanceLogCreate",
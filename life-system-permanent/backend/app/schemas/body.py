@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -19,3 +19,23 @@ class BodyMetricResponse(BodyMetricBase):
 
     class Config:
         from_attributes = True
+
+class BodyMetricBulkUpsertResponse(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    unchanged: int
+
+class BodyTrendPoint(BaseModel):
+    date: datetime
+    value: float
+    moving_average: float
+    rate_of_change: float
+
+class BodyTrendResponse(BaseModel):
+    points: int
+    window: int
+    source_points: int
+    weight: List[BodyTrendPoint] = []
+    muscle_mass: List[BodyTrendPoint] = []
+    fat_percentage: List[BodyTrendPoint] = []
@@ -0,0 +1,12 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.schemas.schemas import PlayerStatsResponse, QuestListItem
+from app.schemas.finance import FinanceSummaryResponse
+from app.schemas.body import BodyMetricResponse
+
+class DashboardResponse(BaseModel):
+    stats: Optional[PlayerStatsResponse] = None
+    quests: List[QuestListItem] = []
+    finance: FinanceSummaryResponse
+    body: Optional[BodyMetricResponse] = None
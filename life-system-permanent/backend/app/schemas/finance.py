@@ -1,5 +1,5 @@
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional
+from datetime import date, datetime
 from pydantic import BaseModel
 from app.models.models import FinanceTypeEnum
 
@@ -22,3 +22,69 @@ class FinanceTransactionResponse(FinanceTransactionBase):
 
     class Config:
         from_attributes = True
+
+class FinanceMonthSummary(BaseModel):
+    month: date
+    income: float
+    expense: float
+    balance: float
+
+class FinanceCategorySummary(BaseModel):
+    type: FinanceTypeEnum
+    category: str
+    total: float
+    transactions: int
+
+class FinanceSummaryResponse(BaseModel):
+    month_from: date
+    month_to: date
+    income: float
+    expense: float
+    balance: float
+    months: List[FinanceMonthSummary] = []
+    categories: List[FinanceCategorySummary] = []
+
+class FinanceForecastMonth(BaseModel):
+    month: date
+    fixed_income: float
+    fixed_expense: float
+    variable_income: float
+    variable_expense: float
+    income: float
+    expense: float
+    balance: float
+    cumulative_balance: float
+
+class FinanceFixedItem(BaseModel):
+    type: FinanceTypeEnum
+    category: str
+    description: Optional[str] = None
+    amount: float
+
+class FinanceVariableAverage(BaseModel):
+    type: FinanceTypeEnum
+    category: str
+    monthly_average: float
+
+class FinanceForecastResponse(BaseModel):
+    months_ahead: int
+    trailing_months: int
+    months: List[FinanceForecastMonth] = []
+    fixed: List[FinanceFixedItem] = []
+    variable: List[FinanceVariableAverage] = []
+
+class FinanceImportRowError(BaseModel):
+    row: int
+    error: str
+
+class FinanceImportResponse(BaseModel):
+    import_id: Optional[str] = None
+    format: str
+    bytes_read: int
+    total_bytes: Optional[int] = None
+    rows_read: int
+    inserted: int
+    duplicates: int
+    failed: int
+    errors: List[FinanceImportRowError] = []
+    done: bool
@@ -0,0 +1,23 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel
+
+RankMetric = Literal["level", "strength", "intelligence", "focus"]
+
+class RankEntryResponse(BaseModel):
+    rank: int
+    id: int
+    name: Optional[str] = None
+    username: Optional[str] = None
+    level: int
+    current_xp: int
+    strength: int
+    intelligence: int
+    focus: int
+
+    class Config:
+        from_attributes = True
+
+class RankAroundResponse(BaseModel):
+    metric: RankMetric
+    rank: Optional[int] = None
+    neighbours: List[RankEntryResponse] = []
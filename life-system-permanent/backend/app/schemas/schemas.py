@@ -4,7 +4,7 @@ Pydantic Schemas - Validação de entrada e saída
 
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
 
@@ -105,6 +105,35 @@ class QuestResponse(BaseModel):
         from_attributes = True
 
 
+class QuestListItem(BaseModel):
+    """
+    Item da listagem de quests ativas. Todos os campos são opcionais para
+    suportar a projeção `fields=`; campos não pedidos são omitidos da resposta.
+    """
+    id: Optional[int] = None
+    user_id: Optional[int] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    difficulty: Optional[QuestDifficultyEnum] = None
+    category: Optional[str] = None
+    xp_reward: Optional[int] = None
+    attribute_reward: Optional[AttributeRewardEnum] = None
+    penalty_hp: Optional[int] = None
+    is_healing: Optional[bool] = None
+    status: Optional[str] = None
+    is_completed: Optional[bool] = None
+    due_date: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class QuestBulkCreateResponse(BaseModel):
+    """Schema de resposta da criação em lote (quests vazio quando ingerido via COPY)."""
+    created: int
+    quests: List[QuestResponse] = []
+
+
 class QuestCompleteResponse(BaseModel):
     """Schema de resposta ao completar quest."""
     quest: QuestResponse
@@ -113,6 +142,32 @@ class QuestCompleteResponse(BaseModel):
     new_level: Optional[int]
     old_level: Optional[int]
     message: str
+    attribute_updated: Optional[str] = None
+
+
+class QuestBatchCompleteRequest(BaseModel):
+    """Schema para completar várias quests de uma vez."""
+    quest_ids: List[int] = Field(..., min_length=1, max_length=100)
+
+
+class QuestBatchItemResult(BaseModel):
+    """Resultado de uma quest dentro do lote."""
+    quest_id: int
+    status: str  # completed | already_completed | not_found
+    xp_gained: int
+    attribute_updated: str
+
+
+class QuestBatchCompleteResponse(BaseModel):
+    """Schema de resposta ao completar quests em lote."""
+    results: List[QuestBatchItemResult]
+    xp_gained: int
+    level_up: bool
+    old_level: int
+    new_level: int
+    levels_gained: int
+    current_xp: int
+    hp: int
 
 
 # ============== FINANCE ==============
@@ -1,5 +1,34 @@
 """Services module - Serviços de negócio."""
 
 from .auth_service import AuthService
+from .quest_service import (
+    QuestService,
+    QuestCompletion,
+    QuestBatchCompletion,
+    QuestNotFoundError,
+    QuestAlreadyCompletedError,
+)
+from .punishment_service import PunishmentService, PlayerStatsNotFoundError
+from .rank_service import RankService
+from .forecast_service import ForecastService
+from .import_service import ImportService, StatementFormatError, StatementTooLargeError
+from .trend_service import TrendService
+from .dashboard_service import DashboardService
 
-__all__ = ["AuthService"]
+__all__ = [
+    "AuthService",
+    "QuestService",
+    "QuestCompletion",
+    "QuestBatchCompletion",
+    "QuestNotFoundError",
+    "QuestAlreadyCompletedError",
+    "PunishmentService",
+    "PlayerStatsNotFoundError",
+    "RankService",
+    "ForecastService",
+    "ImportService",
+    "StatementFormatError",
+    "StatementTooLargeError",
+    "TrendService",
+    "DashboardService",
+]
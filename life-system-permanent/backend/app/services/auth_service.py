@@ -2,13 +2,67 @@
 Auth Service - Lógica de autenticação
 """
 
+from sqlalchemy import event, insert, literal
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from datetime import timedelta
+import os
+import time
 
 from app.models import User, PlayerStats
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.cache import TTLCache
+from app.core.security import (
+    hash_password_async,
+    verify_and_update_password_async,
+    create_access_token,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    TOKEN_PRINCIPAL_CLAIMS,
+)
 from app.schemas import UserRegister, TokenResponse
+from app.services.rank_service import RankService
+
+# Cache de usuários autenticados (por worker), indexado por user_id
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+
+# Modo claims: momento (epoch) da última alteração de cada usuário vista por este worker.
+# Tokens emitidos antes disso não servem como principal e caem na consulta ao banco.
+# Entradas mais velhas que a validade do token não barram mais nada e são descartadas.
+principal_changed_at: dict[int, float] = {}
+
+# SQLSTATE do PostgreSQL para unique_violation
+UNIQUE_VIOLATION = "23505"
+
+
+def _scalar_defaults(model) -> dict:
+    """Defaults Python (escalares) das colunas de um modelo, para inserts em Core/CTE."""
+    return {
+        column.name: column.default.arg
+        for column in model.__table__.columns
+        if column.default is not None and column.default.is_scalar
+    }
+
+
+def _conflict_message(exc: IntegrityError) -> str | None:
+    """
+    Traduz a violação de unicidade em users para a mensagem de erro da API.
+    Retorna None para qualquer outra violação (NOT NULL, FK, outra constraint),
+    que o chamador deve propagar.
+    """
+    cause = getattr(exc.orig, "__cause__", None)
+    sqlstate = getattr(cause, "sqlstate", None)
+    if sqlstate is not None and sqlstate != UNIQUE_VIOLATION:
+        return None
+    
+    constraint = getattr(cause, "constraint_name", None) or str(exc.orig)
+    if "username" in constraint:
+        return "Username já existe"
+    if "email" in constraint:
+        return "Email já registrado"
+    return None
 
 
 class AuthService:
@@ -16,34 +70,52 @@ class AuthService:
     
     @staticmethod
     async def register(db: AsyncSession, user_data: UserRegister) -> User:
-        """Registra um novo usuário."""
-        # Verifica se email já existe
-        result = await db.execute(select(User).where(User.email == user_data.email))
-        if result.scalars().first():
-            raise ValueError("Email já registrado")
-        
-        # Verifica se username já existe
-        result = await db.execute(select(User).where(User.username == user_data.username))
-        if result.scalars().first():
-            raise ValueError("Username já existe")
-        
-        # Cria novo usuário
-        user = User(
-            email=user_data.email,
-            username=user_data.username,
-            hashed_password=hash_password(user_data.password[:72]),
+        """
+        Registra um novo usuário.
+        users e player_stats são inseridos num único statement (CTE com RETURNING);
+        email/username duplicados são detectados pela constraint única, sem pré-checagem.
+        """
+        hashed_password = await hash_password_async(user_data.password[:72])
+        
+        user_values = {
+            **_scalar_defaults(User),
+            "email": user_data.email,
+            "username": user_data.username,
+            "hashed_password": hashed_password,
+        }
+        new_user = (
+            insert(User)
+            .values(**user_values)
+            .returning(*User.__table__.columns)
+            .cte("new_user")
         )
-        db.add(user)
-        await db.flush()
         
-        # Cria estatísticas do jogador
-        player_stats = PlayerStats(user_id=user.id)
-        db.add(player_stats)
+        stats_defaults = _scalar_defaults(PlayerStats)
+        new_stats = (
+            insert(PlayerStats)
+            .from_select(
+                ["user_id", *stats_defaults],
+                select(new_user.c.id, *(literal(value) for value in stats_defaults.values())),
+            )
+            .returning(PlayerStats.user_id)
+            .cte("new_stats")
+        )
         
-        await db.commit()
-        await db.refresh(user)
+        stmt = select(new_user).join(new_stats, new_stats.c.user_id == new_user.c.id)
         
-        return user
+        try:
+            result = await db.execute(stmt)
+            row = result.one()
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            message = _conflict_message(e)
+            if message is None:
+                raise
+            raise ValueError(message)
+        
+        RankService.record(row.id, username=row.username)
+        return User(**row._mapping)
     
     @staticmethod
     async def login(db: AsyncSession, email: str, password: str) -> tuple[User, str]:
@@ -52,24 +124,92 @@ class AuthService:
         result = await db.execute(select(User).where(User.email == email))
         user = result.scalars().first()
         
-        if not user or not verify_password(password, user.hashed_password):
+        if not user:
+            raise ValueError("Email ou senha incorretos")
+        
+        valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+        if not valid:
             raise ValueError("Email ou senha incorretos")
         
         if not user.is_active:
             raise ValueError("Usuário inativo")
         
+        # Rehash transparente quando o custo do bcrypt mudou
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
+        
         # Cria token
-        token = create_access_token({"sub": str(user.id)})
+        claims = {"sub": str(user.id)}
+        if TOKEN_PRINCIPAL_CLAIMS:
+            claims["username"] = user.username
+            claims["is_active"] = bool(user.is_active)
+        token = create_access_token(claims)
         
         return user, token
     
     @staticmethod
     async def get_current_user(db: AsyncSession, user_id: int) -> User:
-        """Obtém usuário atual."""
-        result = await db.execute(select(User).where(User.id == user_id))
-        user = result.scalars().first()
+        """
+        Obtém usuário atual.
+        Consulta o cache de principals antes de ir ao banco. O valor cacheado é um
+        User transiente montado a partir das colunas (nenhuma sessão o possui), então
+        rollback/close da sessão de uma requisição não o expira; trate-o como somente leitura.
+        """
+        user = principal_cache.get(user_id)
+        if user is not None:
+            return user
         
-        if not user:
+        result = await db.execute(select(*User.__table__.columns).where(User.id == user_id))
+        row = result.first()
+        
+        if not row:
             raise ValueError("Usuário não encontrado")
         
+        user = User(**row._mapping)
+        principal_cache.set(user_id, user)
         return user
+    
+    @staticmethod
+    def principal_from_claims(user_id: int, payload: dict) -> User | None:
+        """
+        Monta o usuário a partir das claims do token (modo TOKEN_PRINCIPAL_CLAIMS).
+        Retorna None se o token não carrega as claims necessárias ou se o usuário
+        foi alterado depois da emissão (ex.: desativado); nesses casos o chamador
+        consulta o banco. O objeto é transiente: carrega apenas id, username e is_active.
+        """
+        if "username" not in payload or "is_active" not in payload:
+            return None
+        
+        changed_at = principal_changed_at.get(user_id)
+        if changed_at is not None and payload.get("iat", 0) <= changed_at:
+            return None
+        
+        return User(
+            id=user_id,
+            username=payload["username"],
+            is_active=bool(payload["is_active"]),
+        )
+    
+    @staticmethod
+    def invalidate_user(user_id: int) -> None:
+        """Remove o usuário do cache de principals e invalida as claims já emitidas."""
+        principal_cache.invalidate(user_id)
+        
+        now = time.time()
+        horizon = now - ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        for stale in [uid for uid, changed_at in principal_changed_at.items() if changed_at < horizon]:
+            del principal_changed_at[stale]
+        principal_changed_at[user_id] = now
+    
+    @staticmethod
+    def principal_cache_stats() -> dict:
+        """Hits/misses do cache de principals (exposto em /metrics)."""
+        return principal_cache.stats()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_principal(mapper, connection, target: User) -> None:
+    """Qualquer alteração em um usuário (ex.: desativação) derruba a entrada em cache."""
+    AuthService.invalidate_user(target.id)
@@ -0,0 +1,61 @@
+"""
+Dashboard Service - Resumo da tela inicial com sub-consultas concorrentes
+"""
+
+from datetime import date
+from typing import Awaitable, Callable, TypeVar
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.database import AsyncSessionLocal
+
+T = TypeVar("T")
+
+
+async def _in_own_session(query: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """Uma AsyncSession não aceita operações concorrentes: cada sub-consulta usa a sua conexão do pool."""
+    async with AsyncSessionLocal() as db:
+        return await query(db)
+
+
+class DashboardService:
+    """Serviço do dashboard."""
+
+    @staticmethod
+    async def get_dashboard(user_id: int, quest_limit: int = 5) -> dict:
+        """
+        Stats, quests ativas mais recentes, totais financeiros do mês atual e última
+        métrica corporal. As quatro consultas rodam em paralelo (latência = a mais lenta).
+        """
+        today = date.today()
+
+        async def stats(db: AsyncSession):
+            return await crud.stats.get_by_owner(db, user_id=user_id)
+
+        async def quests(db: AsyncSession):
+            items, _ = await crud.quest.get_active_page(db, user_id=user_id, limit=quest_limit)
+            return items
+
+        async def finance(db: AsyncSession):
+            return await crud.finance.get_summary(
+                db, user_id=user_id, month_from=today, month_to=today
+            )
+
+        async def body(db: AsyncSession):
+            metrics, _ = await crud.body.get_page_by_owner(db, user_id=user_id, limit=1)
+            return metrics[0] if metrics else None
+
+        stats_row, quest_items, finance_summary, latest_body = await asyncio.gather(
+            _in_own_session(stats),
+            _in_own_session(quests),
+            _in_own_session(finance),
+            _in_own_session(body),
+        )
+        return {
+            "stats": stats_row,
+            "quests": quest_items,
+            "finance": finance_summary,
+            "body": latest_body,
+        }
@@ -0,0 +1,164 @@
+"""
+Forecast Service - Projeção de contas fixas (is_fixed) e gasto variável médio
+"""
+
+from datetime import date
+from typing import List, Optional
+import os
+
+import numpy as np
+from sqlalchemy import Date, cast
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+
+from app.core.cache import TTLCache
+from app.models import FinanceTransaction, FinanceTypeEnum
+
+# Horizonte máximo; o cache guarda a projeção completa e cada pedido recorta N meses
+FORECAST_MAX_MONTHS = int(os.getenv("FORECAST_MAX_MONTHS", "24"))
+# Meses completos usados na média do gasto variável (e para considerar uma conta fixa ativa)
+FORECAST_TRAILING_MONTHS = int(os.getenv("FORECAST_TRAILING_MONTHS", "3"))
+
+# Invalidação explícita a cada escrita; o TTL é só uma rede de segurança entre workers
+forecast_cache = TTLCache(
+    maxsize=int(os.getenv("FORECAST_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("FORECAST_CACHE_TTL", "3600")),
+)
+
+
+def _month_index(value: date) -> int:
+    return value.year * 12 + value.month - 1
+
+
+def _month_from_index(index: int) -> date:
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class ForecastService:
+    """Serviço de previsão financeira."""
+
+    @staticmethod
+    def invalidate(user_id: int) -> None:
+        """Descarta a projeção em cache do usuário (chamar após qualquer escrita em finanças)."""
+        forecast_cache.invalidate((user_id, _month_index(date.today())))
+
+    @staticmethod
+    async def forecast(db: AsyncSession, user_id: int, months: int) -> dict:
+        """Projeção dos próximos `months` meses (a partir do mês seguinte ao atual)."""
+        key = (user_id, _month_index(date.today()))
+        projection = forecast_cache.get(key)
+        if projection is None:
+            projection = await ForecastService._project(db, user_id, key[1])
+            forecast_cache.set(key, projection)
+
+        return {**projection, "months_ahead": months, "months": projection["months"][:months]}
+
+    @staticmethod
+    async def _project(db: AsyncSession, user_id: int, current: int) -> dict:
+        window_start = _month_from_index(current - FORECAST_TRAILING_MONTHS)
+        current_start = _month_from_index(current)
+
+        # Contas fixas: última ocorrência de cada série (tipo, categoria, descrição) na janela
+        fixed_rows = (await db.execute(
+            select(
+                FinanceTransaction.type,
+                FinanceTransaction.category,
+                FinanceTransaction.description,
+                FinanceTransaction.amount,
+            )
+            .where(
+                FinanceTransaction.user_id == user_id,
+                FinanceTransaction.is_fixed == True,
+                FinanceTransaction.date >= window_start,
+            )
+            .distinct(
+                FinanceTransaction.type,
+                FinanceTransaction.category,
+                FinanceTransaction.description,
+            )
+            .order_by(
+                FinanceTransaction.type,
+                FinanceTransaction.category,
+                FinanceTransaction.description,
+                FinanceTransaction.date.desc(),
+            )
+        )).all()
+
+        # Gasto variável: somas mensais por (tipo, categoria) nos meses completos da janela
+        month = cast(func.date_trunc("month", FinanceTransaction.date), Date)
+        variable_rows = (await db.execute(
+            select(
+                month,
+                FinanceTransaction.type,
+                FinanceTransaction.category,
+                func.sum(FinanceTransaction.amount),
+            )
+            .where(
+                FinanceTransaction.user_id == user_id,
+                FinanceTransaction.is_fixed.isnot(True),
+                FinanceTransaction.date >= window_start,
+                FinanceTransaction.date < current_start,
+            )
+            .group_by(month, FinanceTransaction.type, FinanceTransaction.category)
+        )).all()
+
+        horizon = np.arange(current + 1, current + 1 + FORECAST_MAX_MONTHS)
+
+        # (séries fixas x meses): cada conta se repete em todos os meses do horizonte
+        fixed_amounts = np.array([row.amount for row in fixed_rows], dtype=np.float64)
+        fixed_income_mask = np.array(
+            [row.type == FinanceTypeEnum.INCOME for row in fixed_rows], dtype=bool
+        )
+        fixed_matrix = np.outer(fixed_amounts, np.ones(horizon.size))
+        fixed_income = fixed_matrix[fixed_income_mask].sum(axis=0)
+        fixed_expense = fixed_matrix[~fixed_income_mask].sum(axis=0)
+
+        # (categorias x meses da janela) -> média por categoria, meses sem lançamento contam como zero
+        categories = sorted({(row.type, row.category) for row in variable_rows})
+        position = {category: i for i, category in enumerate(categories)}
+        history = np.zeros((len(categories), FORECAST_TRAILING_MONTHS), dtype=np.float64)
+        if variable_rows:
+            np.add.at(
+                history,
+                (
+                    np.array([position[(row.type, row.category)] for row in variable_rows]),
+                    np.array([_month_index(row[0]) for row in variable_rows]) - (current - FORECAST_TRAILING_MONTHS),
+                ),
+                np.array([row[3] for row in variable_rows], dtype=np.float64),
+            )
+        averages = history.mean(axis=1) if FORECAST_TRAILING_MONTHS else np.zeros(len(categories))
+        variable_income_mask = np.array(
+            [type == FinanceTypeEnum.INCOME for type, _ in categories], dtype=bool
+        )
+        variable_income = np.full(horizon.size, averages[variable_income_mask].sum())
+        variable_expense = np.full(horizon.size, averages[~variable_income_mask].sum())
+
+        income = fixed_income + variable_income
+        expense = fixed_expense + variable_expense
+        balance = income - expense
+        cumulative = np.cumsum(balance)
+
+        columns = np.column_stack(
+            (fixed_income, fixed_expense, variable_income, variable_expense,
+             income, expense, balance, cumulative)
+        ).round(2).tolist()
+        fields = ("fixed_income", "fixed_expense", "variable_income", "variable_expense",
+                  "income", "expense", "balance", "cumulative_balance")
+
+        return {
+            "trailing_months": FORECAST_TRAILING_MONTHS,
+            "months": [
+                {"month": _month_from_index(int(index)), **dict(zip(fields, values))}
+                for index, values in zip(horizon, columns)
+            ],
+            "fixed": [
+                {"type": row.type, "category": row.category,
+                 "description": row.description, "amount": row.amount}
+                for row in fixed_rows
+            ],
+            "variable": [
+                {"type": type, "category": category, "monthly_average": round(float(average), 2)}
+                for (type, category), average in zip(categories, averages)
+            ],
+        }
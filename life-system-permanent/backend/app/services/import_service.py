@@ -0,0 +1,416 @@
+"""
+Import Service - Importação de extratos bancários (CSV/OFX) em streaming
+"""
+
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import codecs
+import csv
+import hashlib
+import html
+import os
+import re
+import unicodedata
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.models import FinanceTypeEnum
+
+IMPORT_MAX_BYTES = int(os.getenv("FINANCE_IMPORT_MAX_BYTES", str(50 * 1024 * 1024)))
+IMPORT_BATCH_SIZE = int(os.getenv("FINANCE_IMPORT_BATCH_SIZE", "5000"))
+IMPORT_CHUNK_SIZE = 64 * 1024
+IMPORT_MAX_ERRORS = 100
+
+# Progresso por (user_id, import_id); vive na memória do worker que recebeu o upload
+import_progress = TTLCache(maxsize=256, ttl=3600)
+
+# Cabeçalhos aceitos no CSV (sem acento, minúsculos) -> campo canônico
+CSV_HEADER_ALIASES = {
+    "date": {"date", "data", "dt", "data lancamento", "data movimento"},
+    "amount": {"amount", "valor", "value", "quantia", "valor (r$)"},
+    "description": {"description", "descricao", "historico", "memo", "lancamento", "estabelecimento"},
+    "category": {"category", "categoria"},
+    "type": {"type", "tipo"},
+}
+
+TYPE_ALIASES = {
+    "income": FinanceTypeEnum.INCOME, "receita": FinanceTypeEnum.INCOME,
+    "credito": FinanceTypeEnum.INCOME, "c": FinanceTypeEnum.INCOME,
+    "entrada": FinanceTypeEnum.INCOME, "credit": FinanceTypeEnum.INCOME,
+    "expense": FinanceTypeEnum.EXPENSE, "despesa": FinanceTypeEnum.EXPENSE,
+    "debito": FinanceTypeEnum.EXPENSE, "d": FinanceTypeEnum.EXPENSE,
+    "saida": FinanceTypeEnum.EXPENSE, "debit": FinanceTypeEnum.EXPENSE,
+}
+
+# Palavra-chave na descrição -> categoria (mesmas categorias do seed em init_db.py)
+DEFAULT_CATEGORY_RULES = {
+    "salario": "Salário",
+    "freela": "Freelance",
+    "rendimento": "Investimentos",
+    "ifood": "Alimentação",
+    "mercado": "Alimentação",
+    "padaria": "Alimentação",
+    "restaurante": "Alimentação",
+    "uber": "Transporte",
+    "posto": "Transporte",
+    "combustivel": "Transporte",
+    "netflix": "Lazer",
+    "spotify": "Lazer",
+    "farmacia": "Saúde",
+    "drogaria": "Saúde",
+    "curso": "Educação",
+    "aluguel": "Moradia",
+    "condominio": "Moradia",
+    "energia": "Utilidades",
+    "internet": "Utilidades",
+}
+DEFAULT_CATEGORY = "Outros"
+
+OFX_TRANSACTION = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.S | re.I)
+OFX_FIELD = re.compile(r"<(\w+)>([^<\r\n]*)")
+OFX_DATE = re.compile(r"^(\d{8})(\d{6})?")
+
+DATE_FORMATS = ("%d/%m/%Y", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S", "%d-%m-%Y", "%d/%m/%y")
+
+STAGING_COLUMNS = ["type", "amount", "category", "description", "date"]
+
+# ON COMMIT DROP: cada lote cria e descarta a sua tabela de staging
+STAGING_DDL = """
+    CREATE TEMP TABLE IF NOT EXISTS finance_import_staging (
+        type text,
+        amount double precision,
+        category varchar(100),
+        description varchar(255),
+        date timestamp
+    ) ON COMMIT DROP
+"""
+
+# Insere o que ainda não existe para o usuário e soma no rollup mensal, num só statement
+INGEST_SQL = """
+    WITH inserted AS (
+        INSERT INTO finance_transactions (user_id, type, amount, category, description, date, is_fixed)
+        SELECT :user_id, s.type::financetypeenum, s.amount, s.category, s.description, s.date, false
+        FROM finance_import_staging s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM finance_transactions f
+            WHERE f.user_id = :user_id
+              AND f.date = s.date
+              AND f.amount = s.amount
+              AND f.type = s.type::financetypeenum
+              AND f.description IS NOT DISTINCT FROM s.description
+        )
+        RETURNING type, category, date, amount
+    ), rolled AS (
+        INSERT INTO finance_monthly_rollup (user_id, month, type, category, total, transactions)
+        SELECT :user_id, date_trunc('month', date)::date, type, category, sum(amount), count(*)
+        FROM inserted
+        GROUP BY date_trunc('month', date)::date, type, category
+        ON CONFLICT (user_id, month, type, category) DO UPDATE
+        SET total = finance_monthly_rollup.total + excluded.total,
+            transactions = finance_monthly_rollup.transactions + excluded.transactions
+    )
+    SELECT count(*) FROM inserted
+"""
+
+
+class StatementFormatError(ValueError):
+    """Arquivo não reconhecido ou sem as colunas obrigatórias."""
+
+
+class StatementTooLargeError(ValueError):
+    """Arquivo maior que FINANCE_IMPORT_MAX_BYTES."""
+
+
+def _normalize(value: str) -> str:
+    """Minúsculas, sem acentos e sem espaços nas pontas (para cabeçalhos e regras)."""
+    decomposed = unicodedata.normalize("NFKD", value.strip().lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _parse_amount(raw: str) -> float:
+    """
+    Converte um valor monetário, aceitando "1.234,56" (pt-BR) e "1,234.56".
+    Com os dois separadores, o mais à direita é o decimal. Com um só, ele é de milhar
+    quando se repete ou tem exatamente 3 dígitos depois ("1,234" e "1.234" valem 1234:
+    extrato não tem centavo com 3 casas); senão é o decimal ("12,5", "99.90").
+    """
+    value = raw.strip().replace("R$", "").replace(" ", "")
+    if not value:
+        raise ValueError("valor vazio")
+
+    separators = [sep for sep in ",." if sep in value]
+    if len(separators) == 2:
+        decimal = value[max(value.rfind(","), value.rfind("."))]
+    elif separators:
+        sep = separators[0]
+        digits_after = len(value) - value.rfind(sep) - 1
+        decimal = sep if value.count(sep) == 1 and digits_after != 3 else None
+    else:
+        decimal = None
+
+    for sep in separators:
+        if sep != decimal:
+            value = value.replace(sep, "")
+    if decimal:
+        value = value.replace(decimal, ".")
+    return float(value)
+
+
+def _parse_date(raw: str) -> datetime:
+    value = raw.strip()
+    ofx = OFX_DATE.match(value)
+    if ofx:
+        return datetime.strptime(ofx.group(1) + (ofx.group(2) or "000000"), "%Y%m%d%H%M%S")
+    try:
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"data inválida: {raw!r}")
+
+
+def _categorize(description: Optional[str], rules: Dict[str, str]) -> str:
+    if description:
+        normalized = _normalize(description)
+        for keyword, category in rules.items():
+            if keyword in normalized:
+                return category
+    return DEFAULT_CATEGORY
+
+
+def _to_record(fields: Dict[str, Optional[str]], rules: Dict[str, str]) -> tuple:
+    """Converte os campos crus de uma linha em um registro de staging (levanta ValueError)."""
+    amount = _parse_amount(fields.get("amount") or "")
+    date = _parse_date(fields.get("date") or "")
+    description = (fields.get("description") or "").strip()[:255] or None
+
+    raw_type = _normalize(fields.get("type") or "")
+    if raw_type:
+        if raw_type not in TYPE_ALIASES:
+            raise ValueError(f"tipo inválido: {fields['type']!r}")
+        type = TYPE_ALIASES[raw_type]
+    else:
+        type = FinanceTypeEnum.INCOME if amount > 0 else FinanceTypeEnum.EXPENSE
+
+    category = (fields.get("category") or "").strip()[:100] or _categorize(description, rules)
+    return (type.name, round(abs(amount), 2), category, description, date)
+
+
+def _dedupe_key(record: tuple) -> bytes:
+    type, amount, _, description, date = record
+    raw = f"{date.isoformat()}|{type}|{amount!r}|{description or ''}".encode()
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+async def _decoded_chunks(file, encoding: str, progress: dict) -> AsyncIterator[str]:
+    """Lê o upload em blocos, decodificando incrementalmente (nunca o arquivo inteiro)."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    while True:
+        chunk = await file.read(IMPORT_CHUNK_SIZE)
+        if not chunk:
+            break
+        progress["bytes_read"] += len(chunk)
+        if progress["bytes_read"] > IMPORT_MAX_BYTES:
+            raise StatementTooLargeError("Arquivo muito grande")
+        yield decoder.decode(chunk)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def _csv_rows(chunks: AsyncIterator[str]) -> AsyncIterator[Tuple[int, dict]]:
+    """
+    Linhas do CSV como (número da linha, campos canônicos).
+    Junta linhas físicas enquanto houver aspas abertas (campos com quebra de linha).
+    """
+    pending = ""
+    record: List[str] = []
+    quotes = 0
+    line_no = 0
+    start = 0
+    header = None
+    delimiter = ","
+
+    def physical_lines(final: bool):
+        nonlocal pending
+        lines = pending.split("\n")
+        pending = "" if final else lines.pop()
+        return lines
+
+    def records(final: bool):
+        nonlocal record, quotes, line_no, start
+        for line in physical_lines(final):
+            line_no += 1
+            if not record:
+                start = line_no
+            record.append(line.rstrip("\r"))
+            quotes += line.count('"')
+            if quotes % 2:
+                continue
+            full = "\n".join(record)
+            record, quotes = [], 0
+            if full.strip():
+                yield start, full
+
+    def parse(final: bool):
+        nonlocal header, delimiter
+        for number, full in records(final):
+            if header is None:
+                delimiter = max((";", ",", "\t"), key=full.count)
+                names = [_normalize(name) for name in next(csv.reader([full], delimiter=delimiter))]
+                header = [
+                    next((field for field, aliases in CSV_HEADER_ALIASES.items() if name in aliases), None)
+                    for name in names
+                ]
+                missing = {"date", "amount"} - set(header)
+                if missing:
+                    raise StatementFormatError(
+                        f"Colunas obrigatórias ausentes no CSV: {', '.join(sorted(missing))}"
+                    )
+                continue
+            values = next(csv.reader([full], delimiter=delimiter))
+            yield number, {
+                field: value for field, value in zip(header, values) if field is not None
+            }
+
+    async for text_chunk in chunks:
+        pending += text_chunk
+        for row in parse(final=False):
+            yield row
+    for row in parse(final=True):
+        yield row
+
+
+async def _ofx_rows(chunks: AsyncIterator[str]) -> AsyncIterator[Tuple[int, dict]]:
+    """Blocos <STMTTRN> do OFX (SGML ou XML) como (índice da transação, campos canônicos)."""
+    buffer = ""
+    index = 0
+    async for text_chunk in chunks:
+        buffer += text_chunk
+        last = 0
+        for match in OFX_TRANSACTION.finditer(buffer):
+            index += 1
+            fields = {
+                name.upper(): html.unescape(value.strip())
+                for name, value in OFX_FIELD.findall(match.group(1))
+            }
+            yield index, {
+                "date": fields.get("DTPOSTED"),
+                "amount": fields.get("TRNAMT"),
+                "description": fields.get("MEMO") or fields.get("NAME"),
+            }
+            last = match.end()
+        buffer = buffer[last:]
+        # Descarta cabeçalho/saldos já lidos, mantendo um eventual bloco incompleto
+        open_block = buffer.upper().rfind("<STMTTRN>")
+        buffer = buffer[open_block:] if open_block >= 0 else buffer[-16:]
+
+
+def detect_format(filename: Optional[str], head: bytes) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".ofx", ".qfx")) or b"OFXHEADER" in head or b"<OFX>" in head.upper():
+        return "ofx"
+    return "csv"
+
+
+class ImportService:
+    """Serviço de importação de extratos."""
+
+    @staticmethod
+    def progress(user_id: int, import_id: str) -> Optional[dict]:
+        return import_progress.get((user_id, import_id))
+
+    @staticmethod
+    async def _flush(db: AsyncSession, user_id: int, batch: List[tuple]) -> int:
+        """COPY do lote para a staging e INSERT ... SELECT deduplicado; retorna quantas entraram."""
+        connection = await db.connection()
+        await connection.execute(text(STAGING_DDL))
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "finance_import_staging", records=batch, columns=STAGING_COLUMNS
+        )
+        result = await connection.execute(text(INGEST_SQL), {"user_id": user_id})
+        inserted = result.scalar_one()
+        await db.commit()
+        return inserted
+
+    @staticmethod
+    async def import_statement(
+        db: AsyncSession,
+        user_id: int,
+        file,
+        *,
+        format: Optional[str] = None,
+        encoding: str = "utf-8-sig",
+        category_rules: Optional[Dict[str, str]] = None,
+        import_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Importa um extrato (UploadFile ou qualquer objeto com read/seek assíncronos)
+        em lotes de IMPORT_BATCH_SIZE linhas.
+        Cada lote é commitado, então um erro no meio preserva os lotes anteriores.
+        """
+        codecs.lookup(encoding)  # LookupError para encodings desconhecidos
+        if format is None:
+            head = await file.read(1024)
+            await file.seek(0)
+            format = detect_format(file.filename, head)
+
+        rules = {_normalize(k): v for k, v in (category_rules or {}).items()}
+        rules.update({k: v for k, v in DEFAULT_CATEGORY_RULES.items() if k not in rules})
+
+        progress = {
+            "import_id": import_id,
+            "format": format,
+            "bytes_read": 0,
+            "total_bytes": file.size,
+            "rows_read": 0,
+            "inserted": 0,
+            "duplicates": 0,
+            "failed": 0,
+            "errors": [],
+            "done": False,
+        }
+        if import_id:
+            import_progress.set((user_id, import_id), progress)
+
+        parser = _ofx_rows if format == "ofx" else _csv_rows
+        seen = set()
+        batch: List[tuple] = []
+
+        async def flush():
+            inserted = await ImportService._flush(db, user_id, batch)
+            progress["inserted"] += inserted
+            progress["duplicates"] += len(batch) - inserted
+            batch.clear()
+
+        async for row, fields in parser(_decoded_chunks(file, encoding, progress)):
+            progress["rows_read"] += 1
+            try:
+                record = _to_record(fields, rules)
+            except ValueError as e:
+                progress["failed"] += 1
+                if len(progress["errors"]) < IMPORT_MAX_ERRORS:
+                    progress["errors"].append({"row": row, "error": str(e)})
+                continue
+
+            key = _dedupe_key(record)
+            if key in seen:
+                progress["duplicates"] += 1
+                continue
+            seen.add(key)
+
+            batch.append(record)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await flush()
+
+        if batch:
+            await flush()
+        progress["done"] = True
+        return progress
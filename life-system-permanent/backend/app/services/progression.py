@@ -0,0 +1,73 @@
+"""
+Progression - Curva de XP e cálculo de Level Up
+"""
+
+from array import array
+from bisect import bisect_right
+from typing import Callable, Dict
+import os
+
+# Curva: XP necessário para sair do nível `level` para `level + 1`
+XPCurve = Callable[[int], int]
+
+CURVES: Dict[str, XPCurve] = {
+    "linear": lambda level: level * 100,
+    "quadratic": lambda level: 50 * level * level + 50 * level,
+    "exponential": lambda level: int(100 * 1.15 ** (level - 1)),
+}
+
+PROGRESSION_CURVE = os.getenv("PROGRESSION_CURVE", "linear")
+MAX_LEVEL = int(os.getenv("MAX_LEVEL", "1000"))
+
+# current_xp é INTEGER no banco; a tabela para antes de estourar
+MAX_TOTAL_XP = 2**31 - 1
+
+
+class ProgressionTable:
+    """
+    Tabela pré-computada de XP acumulado por nível.
+    `thresholds[i]` é o XP total (desde o nível 1) para alcançar o nível `i + 1`,
+    então aplicar XP é um bisect: O(log L), com quantos level ups forem necessários.
+    Curvas íngremes são truncadas no nível em que o XP acumulado excederia MAX_TOTAL_XP.
+    """
+
+    def __init__(self, curve: XPCurve, max_level: int = MAX_LEVEL):
+        self.curve = curve
+        self.thresholds = array("q", [0])
+        for level in range(1, max_level):
+            total = self.thresholds[-1] + curve(level)
+            if total > MAX_TOTAL_XP:
+                break
+            self.thresholds.append(total)
+        self.max_level = len(self.thresholds)
+        # No nível máximo o XP para de crescer (barra cheia), longe do limite do INTEGER
+        self.max_level_xp = min(curve(self.max_level), MAX_TOTAL_XP - self.thresholds[-1])
+
+    def xp_to_next_level(self, level: int) -> int:
+        """XP necessário no nível atual para subir de nível."""
+        return self.curve(level)
+
+    def total_xp(self, level: int, xp: int) -> int:
+        """XP acumulado desde o nível 1."""
+        level = max(1, min(level, self.max_level))
+        return self.thresholds[level - 1] + xp
+
+    def apply_xp(self, level: int, xp: int, gained: int = 0) -> tuple[int, int]:
+        """
+        Aplica `gained` XP a (level, xp) e retorna o novo (level, xp).
+        O nível nunca diminui, nem quando o nível salvo passa do máximo da tabela
+        atual (ex.: curva ou MAX_LEVEL alterados); a partir do máximo o XP fica
+        limitado a `max_level_xp`.
+        """
+        if level >= self.max_level:
+            return level, min(xp + gained, self.max_level_xp)
+
+        total = self.total_xp(level, xp) + gained
+        new_level = max(level, min(bisect_right(self.thresholds, total), self.max_level))
+        new_xp = total - self.thresholds[new_level - 1]
+        if new_level == self.max_level:
+            new_xp = min(new_xp, self.max_level_xp)
+        return new_level, new_xp
+
+
+progression = ProgressionTable(CURVES[PROGRESSION_CURVE])
@@ -0,0 +1,189 @@
+"""
+Punishment Service - Penalidades de quests diárias atrasadas
+"""
+
+from typing import Optional
+import asyncio
+import os
+import time
+
+from sqlalchemy import literal_column, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+
+from app.core.database import AsyncSessionLocal
+from app.models import Quest, PlayerStats, QuestStatusEnum, QuestCategoryEnum
+
+# Intervalo do sweeper em segundos (0 desativa) e quantas quests por statement
+PUNISHMENT_SWEEP_INTERVAL = float(os.getenv("PUNISHMENT_SWEEP_INTERVAL", "300"))
+PUNISHMENT_SWEEP_BATCH = int(os.getenv("PUNISHMENT_SWEEP_BATCH", "5000"))
+
+quests_table = Quest.__table__
+stats_table = PlayerStats.__table__
+
+# Constantes inline (não bind params) para o planner casar com o índice parcial
+# ix_quests_open_daily_due também em planos genéricos de prepared statements
+DAILY = literal_column(f"'{QuestCategoryEnum.DAILY.name}'")
+COMPLETED = literal_column(f"'{QuestStatusEnum.COMPLETED.name}'")
+FAILED = literal_column(f"'{QuestStatusEnum.FAILED.name}'")
+
+
+class PlayerStatsNotFoundError(ValueError):
+    """Usuário com quests diárias atrasadas, mas sem player_stats para receber o dano."""
+
+
+def build_punishment_statement(user_id: Optional[int] = None, limit: Optional[int] = None):
+    """
+    Monta o statement set-based de punição:
+
+        WITH failed AS (UPDATE quests SET status = FAILED WHERE id IN (
+                            SELECT ... FOR UPDATE SKIP LOCKED) RETURNING ...),
+             damage AS (SELECT user_id, sum(penalty_hp) ... GROUP BY user_id),
+             punished AS (UPDATE player_stats SET hp = greatest(hp - damage, 0)
+                          FROM damage RETURNING user_id, hp)
+        SELECT ... FROM damage LEFT JOIN punished USING (user_id)
+
+    Uma linha por usuário com quests falhadas, com hp NULL quando ele não tem
+    player_stats (as quests são marcadas mesmo assim). A condição de status é
+    reavaliada sob lock, então execuções concorrentes (vários workers, ou
+    check-dailies em dobro) nunca punem a mesma quest duas vezes.
+    """
+    overdue = (
+        select(quests_table.c.id)
+        .where(
+            quests_table.c.category == DAILY,
+            quests_table.c.status.is_distinct_from(COMPLETED),
+            quests_table.c.status.is_distinct_from(FAILED),
+            func.coalesce(quests_table.c.is_completed, False).is_(False),
+            quests_table.c.due_date < func.now(),
+        )
+        .with_for_update(skip_locked=True)
+    )
+    if user_id is not None:
+        overdue = overdue.where(quests_table.c.user_id == user_id)
+    if limit is not None:
+        overdue = overdue.order_by(quests_table.c.id).limit(limit)
+
+    failed = (
+        update(quests_table)
+        .where(quests_table.c.id.in_(overdue.scalar_subquery()))
+        .values(status=QuestStatusEnum.FAILED)
+        .returning(quests_table.c.id, quests_table.c.user_id, quests_table.c.penalty_hp)
+        .cte("failed")
+    )
+
+    damage = (
+        select(
+            failed.c.user_id,
+            func.coalesce(func.sum(failed.c.penalty_hp), 0).label("total_damage"),
+            func.count().label("quests_failed"),
+            func.array_agg(failed.c.id).label("quest_ids"),
+        )
+        .group_by(failed.c.user_id)
+        .cte("damage")
+    )
+
+    punished = (
+        update(stats_table)
+        .where(stats_table.c.user_id == damage.c.user_id)
+        .values(hp=func.greatest(stats_table.c.hp - damage.c.total_damage, 0))
+        .returning(stats_table.c.user_id, stats_table.c.hp)
+        .cte("punished")
+    )
+
+    return select(
+        damage.c.user_id,
+        punished.c.hp,
+        damage.c.total_damage,
+        damage.c.quests_failed,
+        damage.c.quest_ids,
+    ).select_from(damage.outerjoin(punished, punished.c.user_id == damage.c.user_id))
+
+
+class PunishmentService:
+    """Serviço de punição (Hardcore Mode)."""
+
+    last_sweep: dict = {}
+
+    @staticmethod
+    async def check_user(db: AsyncSession, user_id: int) -> Optional[dict]:
+        """
+        Aplica a punição de um único usuário num round trip.
+        Retorna None quando não há quests diárias atrasadas; levanta
+        PlayerStatsNotFoundError (sem marcar as quests) se o usuário não tem player_stats.
+        """
+        result = await db.execute(build_punishment_statement(user_id=user_id))
+        row = result.first()
+
+        if row is not None and row.hp is None:
+            # Desfaz o FAILED: as quests continuam pendentes até existirem stats para o dano
+            await db.rollback()
+            raise PlayerStatsNotFoundError("Player stats not found.")
+
+        await db.commit()
+        if row is None:
+            return None
+
+        return {
+            "processed_quests": sorted(row.quest_ids),
+            "total_damage": row.total_damage,
+            "current_hp": row.hp,
+            "is_dead": row.hp <= 0,
+        }
+
+    @staticmethod
+    async def sweep(db: AsyncSession, batch_size: int = PUNISHMENT_SWEEP_BATCH) -> dict:
+        """
+        Varre todos os usuários: marca DAILY atrasadas como FAILED e desconta o
+        penalty_hp somado por usuário, em lotes de `batch_size` quests.
+        """
+        start = time.perf_counter()
+        quests_failed = 0
+        users_punished = 0
+
+        while True:
+            result = await db.execute(build_punishment_statement(limit=batch_size))
+            rows = result.all()
+            await db.commit()
+
+            # Para pelas quests reivindicadas no lote (LIMIT ... SKIP LOCKED), não pelos
+            # jogadores punidos: quests de quem não tem player_stats também saem da fila
+            claimed = sum(row.quests_failed for row in rows)
+            quests_failed += claimed
+            users_punished += sum(1 for row in rows if row.hp is not None)
+            if claimed < batch_size:
+                break
+
+        return {
+            "quests_failed": quests_failed,
+            "users_punished": users_punished,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+    @staticmethod
+    async def run_sweeper(interval: float = PUNISHMENT_SWEEP_INTERVAL) -> None:
+        """Loop do sweeper em background (iniciado no startup da aplicação)."""
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    PunishmentService.last_sweep = await PunishmentService.sweep(db)
+                stats = PunishmentService.last_sweep
+                if stats["quests_failed"]:
+                    print(
+                        f"⚔️  Punição: {stats['quests_failed']} quests falhadas, "
+                        f"{stats['users_punished']} jogadores em {stats['duration_ms']}ms"
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Erro no sweeper de punição: {e}")
+
+            await asyncio.sleep(interval)
+
+    @staticmethod
+    def start_sweeper() -> Optional[asyncio.Task]:
+        """Agenda o sweeper no event loop atual, se habilitado."""
+        if PUNISHMENT_SWEEP_INTERVAL <= 0:
+            return None
+        return asyncio.create_task(PunishmentService.run_sweeper())
@@ -0,0 +1,319 @@
+"""
+Quest Service - Conclusão de quests e recompensas
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+from sqlalchemy import any_, bindparam, insert, update, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+
+from app.models import User, Quest, PlayerStats, QuestStatusEnum, AttributeRewardEnum
+from app.services.progression import progression
+from app.services.rank_service import RankService
+
+
+# Atributo incrementado por cada tipo de recompensa
+ATTRIBUTE_COLUMNS = {
+    AttributeRewardEnum.STR: ("strength", "Strength"),
+    AttributeRewardEnum.INT: ("intelligence", "Intelligence"),
+    AttributeRewardEnum.FOC: ("focus", "Focus"),
+}
+
+LEVEL_UP_HP_BONUS = 10
+
+
+class QuestNotFoundError(ValueError):
+    """Quest não existe ou não pertence ao usuário."""
+
+
+class QuestAlreadyCompletedError(ValueError):
+    """Quest já foi concluída."""
+
+
+@dataclass
+class QuestCompletion:
+    """Resultado da conclusão de uma quest."""
+    quest: dict
+    xp_gained: int
+    attribute_updated: str
+    old_level: int
+    new_level: int
+    current_xp: int
+    hp: int
+
+    @property
+    def level_up(self) -> bool:
+        return self.new_level > self.old_level
+
+
+@dataclass
+class QuestBatchCompletion:
+    """Resultado da conclusão em lote: itens por quest + variação agregada de nível."""
+    results: List[dict] = field(default_factory=list)
+    xp_gained: int = 0
+    old_level: int = 1
+    new_level: int = 1
+    current_xp: int = 0
+    hp: int = 0
+
+    @property
+    def level_up(self) -> bool:
+        return self.new_level > self.old_level
+
+
+def _open_quest_filter(user_id: int):
+    """Condições de uma quest do usuário que ainda pode ser concluída."""
+    return (
+        Quest.user_id == user_id,
+        Quest.is_completed.is_not(True),
+        Quest.status.is_distinct_from(QuestStatusEnum.COMPLETED),
+    )
+
+
+def _rewarded_columns(user_id: int) -> tuple:
+    """
+    RETURNING de grant_rewards: estado para o level up e os valores absolutos
+    que o leaderboard precisa (atributos e username).
+    """
+    return (
+        PlayerStats.level,
+        PlayerStats.current_xp,
+        PlayerStats.hp,
+        PlayerStats.strength,
+        PlayerStats.intelligence,
+        PlayerStats.focus,
+        select(User.username).where(User.id == user_id).scalar_subquery().label("username"),
+    )
+
+
+def _attribute_label(attribute_reward) -> str:
+    if attribute_reward in ATTRIBUTE_COLUMNS:
+        return ATTRIBUTE_COLUMNS[attribute_reward][1]
+    return "None"
+
+
+class QuestService:
+    """Serviço de quests."""
+
+    @staticmethod
+    async def apply_level_ups(
+        db: AsyncSession, user_id: int, level: int, current_xp: int, hp: int
+    ) -> tuple[int, int, int]:
+        """
+        Converte o XP acumulado em níveis via `progression` e persiste o ajuste
+        (inclusive o teto de XP no nível máximo).
+        Recebe o estado já incrementado (dentro da transação, com a linha travada)
+        e retorna (level, current_xp, hp) finais.
+        """
+        new_level, remaining_xp = progression.apply_xp(level, current_xp)
+        if new_level == level and remaining_xp == current_xp:
+            return level, current_xp, hp
+
+        consumed_xp = current_xp - remaining_xp
+        result = await db.execute(
+            update(PlayerStats)
+            .where(PlayerStats.user_id == user_id, PlayerStats.level == level)
+            .values(
+                level=new_level,
+                current_xp=PlayerStats.current_xp - consumed_xp,
+                hp=PlayerStats.hp + LEVEL_UP_HP_BONUS * (new_level - level),
+            )
+            .returning(PlayerStats.level, PlayerStats.current_xp, PlayerStats.hp)
+        )
+        leveled = result.first()
+        if leveled is None:
+            return level, current_xp, hp
+        return tuple(leveled)
+
+    @staticmethod
+    async def grant_rewards(
+        db: AsyncSession,
+        user_id: int,
+        xp_gained: int,
+        attribute_counts: Counter,
+        quests_completed: int,
+    ) -> dict:
+        """
+        Aplica XP, atributos e contador de quests como incrementos em SQL
+        (um UPDATE ... RETURNING) e retorna as stats resultantes antes do level up:
+        level, current_xp, hp, strength, intelligence, focus e username.
+        """
+        increments = {
+            "current_xp": PlayerStats.current_xp + xp_gained,
+            "quests_completed": PlayerStats.quests_completed + quests_completed,
+        }
+        for attribute, count in attribute_counts.items():
+            column = ATTRIBUTE_COLUMNS[attribute][0]
+            increments[column] = getattr(PlayerStats, column) + count
+
+        result = await db.execute(
+            update(PlayerStats)
+            .where(PlayerStats.user_id == user_id)
+            .values(**increments)
+            .returning(*_rewarded_columns(user_id))
+        )
+        stats = result.mappings().first()
+
+        if stats is None:
+            # Stats ausentes (deveriam existir desde o registro): cria já com a recompensa
+            values = {"user_id": user_id, "current_xp": xp_gained, "quests_completed": quests_completed}
+            for attribute, count in attribute_counts.items():
+                values[ATTRIBUTE_COLUMNS[attribute][0]] = 1 + count
+            result = await db.execute(
+                insert(PlayerStats)
+                .values(**values)
+                .returning(*_rewarded_columns(user_id))
+            )
+            stats = result.mappings().first()
+
+        return dict(stats)
+
+    @staticmethod
+    async def complete_quest(db: AsyncSession, user_id: int, quest_id: int) -> QuestCompletion:
+        """
+        Completa uma quest e aplica as recompensas numa única transação.
+        Usa UPDATE ... RETURNING condicionais (sem carregar objetos ORM), então
+        duas conclusões concorrentes não perdem XP nem pontuam a quest duas vezes.
+        """
+        # 1. Marca a quest como concluída (só vence quem a encontrar ainda aberta)
+        result = await db.execute(
+            update(Quest)
+            .where(Quest.id == quest_id, *_open_quest_filter(user_id))
+            .values(
+                is_completed=True,
+                status=QuestStatusEnum.COMPLETED,
+                completed_at=func.now(),
+            )
+            .returning(*Quest.__table__.columns)
+        )
+        quest = result.mappings().first()
+
+        if quest is None:
+            await db.rollback()
+            exists = await db.execute(
+                select(Quest.id).where(Quest.id == quest_id, Quest.user_id == user_id)
+            )
+            if exists.scalar_one_or_none() is None:
+                raise QuestNotFoundError("Quest não encontrada")
+            raise QuestAlreadyCompletedError("Quest já completada")
+
+        xp_gained = quest["xp_reward"] or 0
+        attribute_counts = Counter()
+        if quest["attribute_reward"] in ATTRIBUTE_COLUMNS:
+            attribute_counts[quest["attribute_reward"]] += 1
+
+        # 2. Incrementa XP, atributo e contador de quests
+        stats = await QuestService.grant_rewards(
+            db, user_id, xp_gained, attribute_counts, 1
+        )
+        old_level = stats["level"]
+
+        # 3. Level Up (múltiplos níveis): só gasta o round trip se subiu de nível
+        new_level, current_xp, hp = await QuestService.apply_level_ups(
+            db, user_id, old_level, stats["current_xp"], stats["hp"]
+        )
+
+        await db.commit()
+        RankService.record(user_id, **{**stats, "level": new_level, "current_xp": current_xp})
+
+        return QuestCompletion(
+            quest=dict(quest),
+            xp_gained=xp_gained,
+            attribute_updated=_attribute_label(quest["attribute_reward"]),
+            old_level=old_level,
+            new_level=new_level,
+            current_xp=current_xp,
+            hp=hp,
+        )
+
+    @staticmethod
+    async def complete_quests(
+        db: AsyncSession, user_id: int, quest_ids: Sequence[int]
+    ) -> QuestBatchCompletion:
+        """
+        Completa várias quests de uma vez: um UPDATE ... WHERE id = ANY(:ids)
+        valida a posse e marca todas, as recompensas são somadas num único
+        incremento de stats e há um só commit.
+        """
+        quest_ids = list(dict.fromkeys(quest_ids))
+
+        result = await db.execute(
+            update(Quest)
+            .where(
+                Quest.id == any_(bindparam("quest_ids", quest_ids, type_=ARRAY(Integer))),
+                *_open_quest_filter(user_id),
+            )
+            .values(
+                is_completed=True,
+                status=QuestStatusEnum.COMPLETED,
+                completed_at=func.now(),
+            )
+            .returning(Quest.id, Quest.xp_reward, Quest.attribute_reward)
+        )
+        completed = {row.id: row for row in result}
+
+        # Só consulta de novo para classificar as que não foram concluídas
+        owned = set(completed)
+        missing = [quest_id for quest_id in quest_ids if quest_id not in completed]
+        if missing:
+            result = await db.execute(
+                select(Quest.id).where(
+                    Quest.id == any_(bindparam("missing_ids", missing, type_=ARRAY(Integer))),
+                    Quest.user_id == user_id,
+                )
+            )
+            owned.update(result.scalars())
+
+        batch = QuestBatchCompletion()
+        attribute_counts = Counter()
+        for quest_id in quest_ids:
+            row = completed.get(quest_id)
+            if row is None:
+                batch.results.append({
+                    "quest_id": quest_id,
+                    "status": "already_completed" if quest_id in owned else "not_found",
+                    "xp_gained": 0,
+                    "attribute_updated": "None",
+                })
+                continue
+
+            xp_gained = row.xp_reward or 0
+            batch.xp_gained += xp_gained
+            if row.attribute_reward in ATTRIBUTE_COLUMNS:
+                attribute_counts[row.attribute_reward] += 1
+            batch.results.append({
+                "quest_id": quest_id,
+                "status": "completed",
+                "xp_gained": xp_gained,
+                "attribute_updated": _attribute_label(row.attribute_reward),
+            })
+
+        if not completed:
+            await db.rollback()
+            stats = await db.execute(
+                select(PlayerStats.level, PlayerStats.current_xp, PlayerStats.hp)
+                .where(PlayerStats.user_id == user_id)
+            )
+            level, current_xp, hp = stats.first() or (1, 0, 100)
+            batch.old_level = batch.new_level = level
+            batch.current_xp, batch.hp = current_xp, hp
+            return batch
+
+        stats = await QuestService.grant_rewards(
+            db, user_id, batch.xp_gained, attribute_counts, len(completed)
+        )
+        batch.old_level = stats["level"]
+        batch.new_level, batch.current_xp, batch.hp = await QuestService.apply_level_ups(
+            db, user_id, batch.old_level, stats["current_xp"], stats["hp"]
+        )
+
+        await db.commit()
+        RankService.record(
+            user_id, **{**stats, "level": batch.new_level, "current_xp": batch.current_xp}
+        )
+        return batch
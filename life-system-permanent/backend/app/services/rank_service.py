@@ -0,0 +1,244 @@
+"""
+Rank Service - Leaderboard em memória com fallback em SQL
+"""
+
+from typing import Dict, List, Optional
+import asyncio
+import os
+import time
+
+from sortedcontainers import SortedList
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+
+from app.core.database import AsyncSessionLocal
+from app.models import User, PlayerStats
+
+# Métricas de ordenação: a primeira coluna manda, level/current_xp desempatam
+METRICS = {
+    "level": ("level", "current_xp"),
+    "strength": ("strength", "level", "current_xp"),
+    "intelligence": ("intelligence", "level", "current_xp"),
+    "focus": ("focus", "level", "current_xp"),
+}
+
+RANK_SNAPSHOT_SIZE = int(os.getenv("RANK_SNAPSHOT_SIZE", "1000"))
+RANK_SNAPSHOT_TTL = float(os.getenv("RANK_SNAPSHOT_TTL", "5"))
+# Cada worker só vê as próprias escritas; o rebuild periódico limita a divergência
+RANK_REBUILD_INTERVAL = float(os.getenv("RANK_REBUILD_INTERVAL", "300"))
+
+PLAYER_FIELDS = ("username", "level", "current_xp", "strength", "intelligence", "focus")
+
+# Escritas recebidas durante um rebuild (por user_id, valores absolutos mais recentes);
+# reaplicadas no leaderboard novo antes da troca. None fora de um rebuild
+_pending: Optional[Dict[int, dict]] = None
+
+
+class Leaderboard:
+    """
+    Estrutura de estatística de ordem: uma SortedList por métrica com chaves
+    (-métrica..., user_id). Posição de um jogador e vizinhança saem em O(log n);
+    o top-N é servido de um snapshot recalculado no máximo a cada RANK_SNAPSHOT_TTL.
+    """
+
+    def __init__(self):
+        self.players: Dict[int, dict] = {}
+        self.indexes = {metric: SortedList() for metric in METRICS}
+        self.snapshots: Dict[str, tuple[float, List[dict]]] = {}
+        self.loaded = False
+
+    @classmethod
+    def from_rows(cls, rows: List[dict]) -> "Leaderboard":
+        """Monta o leaderboard inteiro de uma vez (um sort por métrica, não n inserções)."""
+        board = cls()
+        for row in rows:
+            fields = dict(row)
+            board.players[fields.pop("user_id")] = fields
+        for metric in METRICS:
+            board.indexes[metric] = SortedList(
+                cls._key(metric, player, user_id) for user_id, player in board.players.items()
+            )
+        board.loaded = True
+        return board
+
+    @staticmethod
+    def _key(metric: str, player: dict, user_id: int) -> tuple:
+        return (*(-(player[column] or 0) for column in METRICS[metric]), user_id)
+
+    def upsert(self, user_id: int, **fields) -> None:
+        """Atualiza (ou insere) um jogador e reposiciona suas chaves."""
+        player = self.players.get(user_id)
+        if player is not None:
+            for metric, index in self.indexes.items():
+                index.discard(self._key(metric, player, user_id))
+        else:
+            player = {"username": None, "level": 1, "current_xp": 0,
+                      "strength": 1, "intelligence": 1, "focus": 1}
+            self.players[user_id] = player
+
+        player.update({k: v for k, v in fields.items() if k in PLAYER_FIELDS})
+        for metric, index in self.indexes.items():
+            index.add(self._key(metric, player, user_id))
+
+    def remove(self, user_id: int) -> None:
+        player = self.players.pop(user_id, None)
+        if player is not None:
+            for metric, index in self.indexes.items():
+                index.discard(self._key(metric, player, user_id))
+
+    def _entry(self, rank: int, user_id: int) -> dict:
+        player = self.players[user_id]
+        return {"rank": rank, "id": user_id, "name": player["username"], **player}
+
+    def rank_of(self, user_id: int, metric: str = "level") -> Optional[int]:
+        player = self.players.get(user_id)
+        if player is None:
+            return None
+        return self.indexes[metric].index(self._key(metric, player, user_id)) + 1
+
+    def around(self, user_id: int, metric: str = "level", radius: int = 5) -> List[dict]:
+        rank = self.rank_of(user_id, metric)
+        if rank is None:
+            return []
+        start = max(rank - 1 - radius, 0)
+        keys = self.indexes[metric][start:rank + radius]
+        return [self._entry(start + i + 1, key[-1]) for i, key in enumerate(keys)]
+
+    def top(self, metric: str = "level", limit: int = 50, offset: int = 0) -> List[dict]:
+        if offset + limit > RANK_SNAPSHOT_SIZE:
+            keys = self.indexes[metric][offset:offset + limit]
+            return [self._entry(offset + i + 1, key[-1]) for i, key in enumerate(keys)]
+
+        built_at, snapshot = self.snapshots.get(metric, (0.0, []))
+        if time.monotonic() - built_at > RANK_SNAPSHOT_TTL:
+            keys = self.indexes[metric][:RANK_SNAPSHOT_SIZE]
+            snapshot = [self._entry(i + 1, key[-1]) for i, key in enumerate(keys)]
+            self.snapshots[metric] = (time.monotonic(), snapshot)
+        return snapshot[offset:offset + limit]
+
+
+leaderboard = Leaderboard()
+
+
+def _ranked_query(metric: str):
+    """Fallback em SQL: rank() via window function sobre player_stats."""
+    order = [getattr(PlayerStats, column).desc() for column in METRICS[metric]]
+    return (
+        select(
+            func.rank().over(order_by=[*order, PlayerStats.user_id]).label("rank"),
+            PlayerStats.user_id.label("id"),
+            User.username.label("name"),
+            User.username,
+            PlayerStats.level,
+            PlayerStats.current_xp,
+            PlayerStats.strength,
+            PlayerStats.intelligence,
+            PlayerStats.focus,
+        )
+        .join(User, User.id == PlayerStats.user_id)
+        .subquery("ranked")
+    )
+
+
+class RankService:
+    """Serviço de ranking."""
+
+    @staticmethod
+    async def load(db: AsyncSession) -> int:
+        """
+        Reconstrói o leaderboard a partir de player_stats (startup e rebuild periódico).
+        Escritas que chegam enquanto a consulta e o sort rodam ficam em `_pending` e são
+        reaplicadas no leaderboard novo, sem await entre o replay e a troca.
+        """
+        global leaderboard, _pending
+        _pending = {}
+        try:
+            result = await db.execute(
+                select(
+                    PlayerStats.user_id,
+                    User.username,
+                    PlayerStats.level,
+                    PlayerStats.current_xp,
+                    PlayerStats.strength,
+                    PlayerStats.intelligence,
+                    PlayerStats.focus,
+                ).join(User, User.id == PlayerStats.user_id)
+            )
+            rows = [dict(row) for row in result.mappings()]
+            # Ordenar centenas de milhares de chaves fora do event loop
+            fresh = await asyncio.to_thread(Leaderboard.from_rows, rows)
+
+            for user_id, fields in _pending.items():
+                fresh.upsert(user_id, **fields)
+            leaderboard = fresh
+        finally:
+            _pending = None
+        return len(fresh.players)
+
+    @staticmethod
+    def record(user_id: int, **fields) -> None:
+        """
+        Grava no leaderboard em memória os valores absolutos do jogador já
+        commitados (ex.: o RETURNING de grant_rewards); chaves fora de PLAYER_FIELDS
+        são ignoradas. Durante um rebuild a escrita também entra em `_pending`.
+        """
+        if _pending is not None:
+            _pending.setdefault(user_id, {}).update(fields)
+        if leaderboard.loaded:
+            leaderboard.upsert(user_id, **fields)
+
+    @staticmethod
+    async def top(db: AsyncSession, metric: str = "level", limit: int = 50, offset: int = 0) -> List[dict]:
+        if leaderboard.loaded:
+            return leaderboard.top(metric, limit, offset)
+
+        ranked = _ranked_query(metric)
+        result = await db.execute(
+            select(ranked).order_by(ranked.c.rank).offset(offset).limit(limit)
+        )
+        return [dict(row) for row in result.mappings()]
+
+    @staticmethod
+    async def around(db: AsyncSession, user_id: int, metric: str = "level", radius: int = 5) -> tuple[Optional[int], List[dict]]:
+        """Posição do jogador e os vizinhos (radius acima e abaixo)."""
+        if leaderboard.loaded:
+            return leaderboard.rank_of(user_id, metric), leaderboard.around(user_id, metric, radius)
+
+        ranked = _ranked_query(metric)
+        me = (
+            select(ranked.c.rank)
+            .where(ranked.c.id == user_id)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(ranked, me.label("my_rank"))
+            .where(ranked.c.rank.between(me - radius, me + radius))
+            .order_by(ranked.c.rank)
+        )
+        rows = [dict(row) for row in result.mappings()]
+        my_rank = rows[0].pop("my_rank") if rows else None
+        for row in rows:
+            row.pop("my_rank", None)
+        return my_rank, rows
+
+    @staticmethod
+    async def run_rebuilder(interval: float = RANK_REBUILD_INTERVAL) -> None:
+        """Carrega o leaderboard e o reconstrói periodicamente."""
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    players = await RankService.load(db)
+                print(f"🏆 Leaderboard carregado: {players} jogadores")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Erro ao carregar leaderboard (usando fallback SQL): {e}")
+
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+
+    @staticmethod
+    def start_rebuilder() -> asyncio.Task:
+        return asyncio.create_task(RankService.run_rebuilder())
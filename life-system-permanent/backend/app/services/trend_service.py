@@ -0,0 +1,118 @@
+"""
+Trend Service - Séries de métricas corporais reduzidas (LTTB) para gráficos
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+
+TREND_METRICS = ("weight", "muscle_mass", "fat_percentage")
+
+SECONDS_PER_DAY = 86400.0
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: índices de `threshold` pontos que preservam a forma
+    da série. O primeiro e o último ponto são sempre mantidos.
+    """
+    n = x.size
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # threshold - 2 baldes entre o primeiro e o último ponto
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < edges.size:
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        # Área do triângulo (ponto escolhido anterior, candidato, média do próximo balde)
+        area = np.abs(
+            (x[a] - next_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def moving_average(y: np.ndarray, window: int) -> np.ndarray:
+    """Média móvel à direita (últimas `window` amostras), sem perder as primeiras posições."""
+    cumulative = np.concatenate(([0.0], np.cumsum(y)))
+    index = np.arange(y.size)
+    lower = np.maximum(index - window + 1, 0)
+    return (cumulative[index + 1] - cumulative[lower]) / (index + 1 - lower)
+
+
+def rate_of_change(x_days: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Variação por dia: diferença central, lateral nas pontas; zeros quando há um único ponto.
+    Onde o intervalo é nulo (medições no mesmo instante) a taxa é 0.0, sem dividir por zero.
+    """
+    if y.size < 2:
+        return np.zeros_like(y)
+    index = np.arange(y.size)
+    before = np.maximum(index - 1, 0)
+    after = np.minimum(index + 1, y.size - 1)
+    span = x_days[after] - x_days[before]
+    rates = np.zeros_like(y)
+    np.divide(y[after] - y[before], span, out=rates, where=span > 0)
+    return rates
+
+
+class TrendService:
+    """Serviço de tendências."""
+
+    @staticmethod
+    async def body_trend(
+        db: AsyncSession,
+        user_id: int,
+        *,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        points: int = 200,
+        window: int = 7,
+    ) -> dict:
+        """
+        Para cada métrica: até `points` pontos escolhidos por LTTB, com média móvel
+        (`window` medições) e taxa de variação diária calculadas na série completa.
+        """
+        rows = await crud.body.get_series(
+            db, user_id=user_id, columns=TREND_METRICS, date_from=date_from, date_to=date_to
+        )
+        dates = np.array([row[0] for row in rows], dtype="datetime64[s]")
+        values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(TREND_METRICS))
+
+        trend = {"points": points, "window": window, "source_points": len(rows)}
+        for column, metric in enumerate(TREND_METRICS):
+            present = ~np.isnan(values[:, column])
+            metric_dates = dates[present]
+            y = values[present, column]
+            x_days = (metric_dates - metric_dates[0]).astype(np.float64) / SECONDS_PER_DAY if y.size else y
+
+            averages = moving_average(y, window)
+            rates = rate_of_change(x_days, averages)
+            selected = lttb(x_days, y, points)
+
+            trend[metric] = [
+                {
+                    "date": metric_dates[i].item(),
+                    "value": round(float(y[i]), 3),
+                    "moving_average": round(float(averages[i]), 3),
+                    "rate_of_change": round(float(rates[i]), 4),
+                }
+                for i in selected
+            ]
+        return trend
@@ -0,0 +1,33 @@
+"""
+Reconstrói finance_monthly_rollup a partir de finance_transactions.
+
+Uso (a partir de backend/):
+    python rebuild_finance_rollup.py            # todos os usuários
+    python rebuild_finance_rollup.py <user_id>  # apenas um usuário
+"""
+
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import engine, AsyncSessionLocal
+from app import crud
+
+
+async def rebuild(user_id=None):
+    async with AsyncSessionLocal() as session:
+        rows = await crud.finance.rebuild_rollup(session, user_id=user_id)
+    await engine.dispose()
+    scope = f"usuário {user_id}" if user_id is not None else "todos os usuários"
+    print(f"✅ Rollup mensal reconstruído ({scope}): {rows} linhas")
+
+
+if __name__ == "__main__":
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    try:
+        asyncio.run(rebuild(target))
+    except Exception as e:
+        print(f"\n❌ Erro ao reconstruir rollup: {e}")
+        sys.exit(1)
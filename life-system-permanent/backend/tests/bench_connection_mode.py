@@ -0,0 +1,102 @@
+"""
+Benchmark: latência das SELECTs quentes com e sem cache de prepared statements.
+
+Uso (a partir de backend/, com uma URL de conexão DIRETA — o modo "direct" não é
+seguro através de um pooler em modo transação):
+    DATABASE_URL=postgresql://... python tests/bench_connection_mode.py [repeticoes]
+
+Para cada modo (app/core/database.py: build_engine) roda as consultas do dashboard
+(stats, quests ativas, finanças, última métrica corporal) em sequência numa sessão
+e imprime p50/p99 por consulta:
+- "direct": statement_cache_size > 0, parse/plan uma vez por conexão;
+- "transaction_pooler": sem cache, nomes únicos, um prepare por execução.
+Cria um usuário descartável e remove ao final.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import crud
+from app.core.database import DATABASE_URL, build_engine
+from app.models import User
+
+MODES = ("direct", "transaction_pooler")
+
+
+def hot_queries(user_id):
+    today = date.today()
+    return {
+        "stats": lambda db: crud.stats.get_by_owner(db, user_id=user_id),
+        "quests": lambda db: crud.quest.get_active_page(db, user_id=user_id, limit=5),
+        "finance": lambda db: crud.finance.get_summary(
+            db, user_id=user_id, month_from=today, month_to=today
+        ),
+        "body": lambda db: crud.body.get_page_by_owner(db, user_id=user_id, limit=1),
+    }
+
+
+def percentile(timings, p):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+async def run_mode(mode, user_id, repeat):
+    # Uma conexão: o cache de statements é por conexão
+    engine = build_engine(DATABASE_URL, mode, pool_size=1)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    timings = {name: [] for name in hot_queries(user_id)}
+    try:
+        async with session_factory() as db:
+            # Aquecimento (conexão, introspecção de tipos do asyncpg)
+            for query in hot_queries(user_id).values():
+                await query(db)
+            await db.rollback()
+
+            for _ in range(repeat):
+                for name, query in hot_queries(user_id).items():
+                    start = time.perf_counter()
+                    await query(db)
+                    timings[name].append((time.perf_counter() - start) * 1000)
+                await db.rollback()
+    finally:
+        await engine.dispose()
+
+    for name, values in timings.items():
+        print(
+            f"{mode:<20} {name:<8} p50={statistics.median(values):6.2f} ms  "
+            f"p99={percentile(values, 0.99):6.2f} ms"
+        )
+
+
+async def run_benchmark(repeat):
+    engine = build_engine(DATABASE_URL, "transaction_pooler", pool_size=1)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as db:
+        ts = int(time.time() * 1000)
+        user = User(email=f"bench_conn_{ts}@example.com", username=f"bench_conn_{ts}", hashed_password="x")
+        db.add(user)
+        await db.commit()
+        user_id = user.id
+
+    try:
+        for mode in MODES:
+            await run_mode(mode, user_id, repeat)
+    finally:
+        async with session_factory() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    asyncio.run(run_benchmark(n))
@@ -0,0 +1,103 @@
+"""
+Benchmark: importação de extrato CSV (ImportService) com N linhas.
+
+Uso (a partir de backend/, com `alembic upgrade head` já aplicado):
+    DATABASE_URL=postgresql://... python tests/bench_finance_import.py [linhas]
+
+Gera um CSV pt-BR em disco, importa duas vezes (a segunda deve sair inteira como
+duplicata) e imprime linhas/s de cada passada. Cria um usuário descartável e remove
+tudo ao final.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import delete
+
+from app.core.database import engine, AsyncSessionLocal
+from app.models import User, FinanceTransaction, FinanceMonthlyRollup
+from app.services import ImportService
+
+DESCRIPTIONS = ["IFOOD *Pedido", "Uber Trip", "Mercado Central", "Salario", "Netflix", "Posto BR", "Loja"]
+
+
+class AsyncFile:
+    """Adaptador mínimo com a interface assíncrona de UploadFile (read/seek)."""
+
+    def __init__(self, path):
+        self.filename = os.path.basename(path)
+        self.size = os.path.getsize(path)
+        self._file = open(path, "rb")
+
+    async def read(self, size=-1):
+        return self._file.read(size)
+
+    async def seek(self, offset):
+        self._file.seek(offset)
+
+    def close(self):
+        self._file.close()
+
+
+def write_statement(path, rows):
+    start = datetime(2025, 1, 1)
+    rng = random.Random(42)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Data;Descrição;Valor\n")
+        for i in range(rows):
+            date = start + timedelta(minutes=i)
+            description = f"{rng.choice(DESCRIPTIONS)} #{i}"
+            amount = rng.uniform(-500, 500)
+            f.write(f"{date:%d/%m/%Y %H:%M};{description};{amount:.2f}".replace(".", ",") + "\n")
+
+
+async def run_once(label, user_id, path):
+    upload = AsyncFile(path)
+    try:
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            summary = await ImportService.import_statement(db, user_id, upload, format="csv")
+            elapsed = time.perf_counter() - start
+    finally:
+        upload.close()
+    print(
+        f"{label:<8} rows={summary['rows_read']}  inserted={summary['inserted']}  "
+        f"duplicates={summary['duplicates']}  failed={summary['failed']}  "
+        f"{elapsed:.2f}s ({summary['rows_read'] / elapsed:,.0f} rows/s)"
+    )
+
+
+async def run_benchmark(rows):
+    path = os.path.join(tempfile.mkdtemp(), "statement.csv")
+    write_statement(path, rows)
+
+    async with AsyncSessionLocal() as db:
+        ts = int(time.time() * 1000)
+        user = User(email=f"bench_import_{ts}@example.com", username=f"bench_import_{ts}", hashed_password="x")
+        db.add(user)
+        await db.commit()
+        user_id = user.id
+
+    try:
+        await run_once("first", user_id, path)
+        await run_once("again", user_id, path)
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(FinanceMonthlyRollup).where(FinanceMonthlyRollup.user_id == user_id))
+            await db.execute(delete(FinanceTransaction).where(FinanceTransaction.user_id == user_id))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    asyncio.run(run_benchmark(n))
@@ -0,0 +1,149 @@
+"""
+Benchmark: planos e latência das consultas quentes por usuário, com e sem os índices
+da migration c4e1a7d2b9f3.
+
+Uso (a partir de backend/, com `alembic upgrade head` já aplicado):
+    DATABASE_URL=postgresql://... python tests/bench_indexes.py [usuarios] [linhas_por_usuario]
+
+Semeia um dataset grande com generate_series, roda EXPLAIN (ANALYZE, BUFFERS) de cada
+consulta com os índices ("after") e, dentro de uma transação que remove os índices e
+faz rollback no final, sem eles ("before"). Os dados semeados são apagados ao final.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+PREFIX = "bench_idx_"
+
+NEW_INDEXES = [
+    "ix_quests_user_open_created",
+    "ix_quests_open_daily_due",
+    "ix_finance_transactions_user_date",
+    "ix_body_metrics_user_date",
+]
+
+QUERIES = {
+    "get_quests (user, open, created_at desc)": """
+        SELECT * FROM quests
+        WHERE user_id = :user_id AND is_completed = false
+        ORDER BY created_at DESC
+    """,
+    "finance list (user, date desc)": """
+        SELECT * FROM finance_transactions
+        WHERE user_id = :user_id
+        ORDER BY date DESC, id DESC LIMIT 100
+    """,
+    "body list (user, date desc)": """
+        SELECT * FROM body_metrics
+        WHERE user_id = :user_id
+        ORDER BY date DESC, id DESC LIMIT 100
+    """,
+    "punishment sweep candidates": """
+        SELECT id FROM quests
+        WHERE category = 'DAILY'
+          AND status IS DISTINCT FROM 'COMPLETED'
+          AND status IS DISTINCT FROM 'FAILED'
+          AND coalesce(is_completed, false) IS false
+          AND due_date < now()
+        ORDER BY id LIMIT 5000
+    """,
+}
+
+SEED = [
+    """
+    INSERT INTO users (email, username, hashed_password, is_active)
+    SELECT :prefix || g || '@example.com', :prefix || g, 'x', true
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO quests (user_id, title, difficulty, category, xp_reward, penalty_hp,
+                        is_healing, status, is_completed, due_date, created_at)
+    SELECT u.id, 'Quest ' || g, 'E', (ARRAY['DAILY','STORY','SIDE_QUEST'])[1 + g % 3]::questcategoryenum,
+           10, 5, false,
+           (CASE WHEN g % 4 = 0 THEN 'COMPLETED' ELSE 'AVAILABLE' END)::queststatusenum,
+           g % 4 = 0, now() + (g % 20 - 10) * interval '1 day', now() - g * interval '1 minute'
+    FROM users u, generate_series(1, :rows) g
+    WHERE u.email LIKE :prefix || '%'
+    """,
+    """
+    INSERT INTO finance_transactions (user_id, type, amount, category, date, is_fixed)
+    SELECT u.id, (CASE WHEN g % 5 = 0 THEN 'INCOME' ELSE 'EXPENSE' END)::financetypeenum,
+           (g % 500) + 0.99, 'Cat ' || (g % 12), now() - g * interval '1 hour', g % 30 = 0
+    FROM users u, generate_series(1, :rows) g
+    WHERE u.email LIKE :prefix || '%'
+    """,
+    """
+    INSERT INTO body_metrics (user_id, date, weight, muscle_mass, fat_percentage)
+    SELECT u.id, now() - g * interval '1 day', 80 + (g % 50) / 10.0, 35, 18
+    FROM users u, generate_series(1, :rows) g
+    WHERE u.email LIKE :prefix || '%'
+    """,
+]
+
+CLEANUP = [
+    "DELETE FROM quests WHERE user_id IN (SELECT id FROM users WHERE email LIKE :prefix || '%')",
+    "DELETE FROM finance_transactions WHERE user_id IN (SELECT id FROM users WHERE email LIKE :prefix || '%')",
+    "DELETE FROM body_metrics WHERE user_id IN (SELECT id FROM users WHERE email LIKE :prefix || '%')",
+    "DELETE FROM users WHERE email LIKE :prefix || '%'",
+]
+
+
+async def explain_all(conn, user_id, label, repeat=20):
+    print(f"\n===== {label} =====")
+    for name, sql in QUERIES.items():
+        plan = await conn.execute(
+            text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), {"user_id": user_id}
+        )
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await conn.execute(text(sql), {"user_id": user_id})
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        print(f"\n--- {name}: median {latencies[len(latencies) // 2]:.2f}ms")
+        for line in plan.scalars():
+            print(f"    {line}")
+
+
+async def run_benchmark(users, rows):
+    async with engine.begin() as conn:
+        print(f"Semeando {users} usuários x {rows} linhas por tabela...")
+        for sql in SEED:
+            await conn.execute(text(sql), {"prefix": PREFIX, "users": users, "rows": rows})
+        for table in ("users", "quests", "finance_transactions", "body_metrics"):
+            await conn.execute(text(f"ANALYZE {table}"))
+
+    try:
+        async with engine.connect() as conn:
+            user_id = (await conn.execute(
+                text("SELECT id FROM users WHERE email LIKE :prefix || '%' LIMIT 1"),
+                {"prefix": PREFIX},
+            )).scalar_one()
+
+            await explain_all(conn, user_id, "AFTER (com índices)")
+
+            # DROP INDEX é transacional: o rollback restaura os índices
+            transaction = await conn.begin()
+            for name in NEW_INDEXES:
+                await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            await explain_all(conn, user_id, "BEFORE (sem índices)")
+            await transaction.rollback()
+    finally:
+        async with engine.begin() as conn:
+            for sql in CLEANUP:
+                await conn.execute(text(sql), {"prefix": PREFIX})
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    n_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    asyncio.run(run_benchmark(n_users, n_rows))
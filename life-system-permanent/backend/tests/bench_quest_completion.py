@@ -0,0 +1,125 @@
+"""
+Benchmark: conclusão de quest — fluxo ORM antigo vs QuestService (UPDATE ... RETURNING).
+
+Uso (a partir de backend/):
+    DATABASE_URL=postgresql://... python tests/bench_quest_completion.py [n_quests]
+
+Mede statements por conclusão (round trips, sem contar o COMMIT) e latência p50/p99.
+Cria um usuário descartável e remove tudo ao final.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import delete, event, insert
+from sqlalchemy.future import select
+
+from app.core.database import engine, AsyncSessionLocal
+from app.models import User, PlayerStats, Quest, AttributeRewardEnum
+from app.services import QuestService
+
+statement_count = 0
+
+
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    global statement_count
+    statement_count += 1
+
+
+async def legacy_complete(db, user_id, quest_id):
+    """Reprodução do fluxo anterior: SELECT quest, SELECT stats, mutação em Python, commit, refresh."""
+    quest = (await db.execute(
+        select(Quest).where(Quest.id == quest_id, Quest.user_id == user_id)
+    )).scalar_one_or_none()
+    stats = (await db.execute(
+        select(PlayerStats).where(PlayerStats.user_id == user_id)
+    )).scalar_one_or_none()
+
+    quest.is_completed = True
+    quest.completed_at = datetime.now()
+    stats.current_xp += quest.xp_reward
+    if quest.attribute_reward == AttributeRewardEnum.STR:
+        stats.strength += 1
+
+    xp_threshold = stats.level * 100
+    if stats.current_xp >= xp_threshold:
+        stats.level += 1
+        stats.current_xp -= xp_threshold
+        stats.hp += 10
+
+    await db.commit()
+    await db.refresh(quest)
+
+
+async def setup(n_quests):
+    async with AsyncSessionLocal() as db:
+        ts = int(time.time() * 1000)
+        user = User(email=f"bench_{ts}@example.com", username=f"bench_{ts}", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        db.add(PlayerStats(user_id=user.id))
+        result = await db.execute(
+            insert(Quest).returning(Quest.id),
+            [
+                {
+                    "user_id": user.id,
+                    "title": f"Bench {i}",
+                    "xp_reward": 40,
+                    "attribute_reward": AttributeRewardEnum.STR,
+                    "is_completed": False,
+                }
+                for i in range(n_quests)
+            ],
+        )
+        quest_ids = list(result.scalars())
+        await db.commit()
+        return user.id, quest_ids
+
+
+async def teardown(user_id):
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Quest).where(Quest.user_id == user_id))
+        await db.execute(delete(PlayerStats).where(PlayerStats.user_id == user_id))
+        await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+
+
+async def measure(label, func, user_id, quest_ids):
+    global statement_count
+    latencies = []
+    statement_count = 0
+    for quest_id in quest_ids:
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await func(db, user_id, quest_id)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    per_call = statement_count / len(quest_ids)
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<14} statements/call={per_call:.2f}  "
+        f"p50={quantiles[49]:.2f}ms  p99={quantiles[98]:.2f}ms"
+    )
+
+
+async def run_benchmark(n_quests):
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    user_id, quest_ids = await setup(n_quests)
+    half = len(quest_ids) // 2
+    try:
+        await measure("before (ORM)", legacy_complete, user_id, quest_ids[:half])
+        await measure("after (service)", QuestService.complete_quest, user_id, quest_ids[half:])
+    finally:
+        await teardown(user_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    asyncio.run(run_benchmark(n))
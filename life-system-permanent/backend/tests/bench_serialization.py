@@ -0,0 +1,94 @@
+"""
+Benchmark: serialização de listas por 1k linhas (sem banco).
+
+Uso (a partir de backend/):
+    python tests/bench_serialization.py [linhas] [repeticoes]
+
+Compara, para GET /finance/:
+- "orm + encoder": instâncias ORM -> model_validate item a item -> jsonable_encoder
+  -> json.dumps (o caminho padrão do FastAPI com JSONResponse);
+- "orm + dump_json": o mesmo validate, serializado por pydantic-core como o FastAPI
+  faz em rotas com `response_model` e a classe de resposta padrão;
+- "rows + adapter": Rows (namedtuple, mesma interface de sqlalchemy Row) ->
+  TypeAdapter.validate_python + dump_json (app/api/v1/responses.py).
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.api.v1.endpoints.finance import finance_transaction_list_adapter
+from app.models import FinanceTransaction, FinanceTypeEnum
+from app.schemas.finance import FinanceTransactionResponse
+
+COLUMNS = [column.name for column in FinanceTransaction.__table__.columns]
+FinanceRow = namedtuple("FinanceRow", COLUMNS)
+
+
+def make_rows(n):
+    now = datetime(2026, 1, 1)
+    return [
+        {
+            "id": i,
+            "user_id": 1,
+            "type": FinanceTypeEnum.EXPENSE if i % 5 else FinanceTypeEnum.INCOME,
+            "amount": 10.5 + i,
+            "category": f"Cat {i % 12}",
+            "description": f"Transação {i}",
+            "date": now - timedelta(hours=i),
+            "is_fixed": i % 30 == 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(n)
+    ]
+
+
+def orm_encoder(objects):
+    items = [FinanceTransactionResponse.model_validate(obj) for obj in objects]
+    return json.dumps(jsonable_encoder(items)).encode()
+
+
+response_list_adapter = TypeAdapter(list[FinanceTransactionResponse])
+
+
+def orm_dump_json(objects):
+    items = [FinanceTransactionResponse.model_validate(obj) for obj in objects]
+    return response_list_adapter.dump_json(items)
+
+
+def rows_adapter(rows):
+    adapter = finance_transaction_list_adapter
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def measure(label, func, data, repeat, n):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        timings.append((time.perf_counter() - start) * 1000)
+    per_1k = statistics.median(timings) * 1000 / n
+    print(f"{label:<16} {per_1k:8.2f} ms / 1k rows")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    raw = make_rows(n)
+    objects = [FinanceTransaction(**row) for row in raw]
+    rows = [FinanceRow(**row) for row in raw]
+
+    measure("orm + encoder", orm_encoder, objects, repeat, n)
+    measure("orm + dump_json", orm_dump_json, objects, repeat, n)
+    measure("rows + adapter", rows_adapter, rows, repeat, n)
@@ -0,0 +1,100 @@
+"""
+Orçamento de queries por rota: falha se uma rota passar a executar mais SQL que o previsto
+(ex.: um N+1 introduzido sem querer).
+
+Uso como script (a partir de backend/, banco configurado):
+    DATABASE_URL=postgresql://... python tests/query_budget.py
+
+Uso como helper:
+    from tests.query_budget import assert_max_queries
+    response = await assert_max_queries(client, "GET", "/api/v1/finance/", 2, headers=auth)
+
+As requisições passam pelo app via httpx.ASGITransport (sem servidor), então o
+MetricsMiddleware conta os statements de cada uma.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+
+from app.core import metrics
+from app.core.database import engine
+from app.main import app
+
+# Máximo de statements SQL por requisição (inclui a autenticação com cache frio)
+BUDGETS = [
+    ("GET", "/api/v1/auth/me", 2),
+    ("GET", "/api/v1/stats/", 3),
+    ("GET", "/api/v1/quests", 2),
+    ("GET", "/api/v1/quests?count=exact", 3),
+    ("GET", "/api/v1/finance/", 2),
+    ("GET", "/api/v1/finance/summary", 2),
+    ("GET", "/api/v1/body/", 2),
+    ("GET", "/api/v1/rank/", 2),
+    ("GET", "/api/v1/dashboard/", 5),
+]
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A rota executou mais statements que o orçamento."""
+
+
+async def assert_max_queries(client, method, url, max_queries, **kwargs):
+    """Executa a requisição e falha se ela rodar mais de `max_queries` statements SQL."""
+    response = await client.request(method, url, **kwargs)
+    request = metrics.last_request
+    if request is None:
+        raise RuntimeError("MetricsMiddleware não registrou a requisição (METRICS_ENABLED?)")
+
+    if request.statements > max_queries:
+        shapes = "\n".join(
+            f"    {count}x {shape}" for shape, count in (request.fingerprints or {}).items()
+        )
+        raise QueryBudgetExceeded(
+            f"{method} {request.route}: {request.statements} queries (máximo {max_queries})"
+            + (f"\n{shapes}" if shapes else "")
+        )
+    return response
+
+
+async def run_budgets():
+    # Fingerprints para o relatório de falha
+    metrics.SQL_DEBUG = True
+    ts = int(time.time() * 1000)
+    credentials = {
+        "email": f"budget_{ts}@example.com",
+        "username": f"budget_{ts}",
+        "password": "budget-password",
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    failures = 0
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/v1/auth/register", json=credentials)
+        response.raise_for_status()
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": credentials["email"], "password": credentials["password"]},
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        for method, url, budget in BUDGETS:
+            try:
+                await assert_max_queries(client, method, url, budget, headers=headers)
+                print(f"✅ {method} {url}: {metrics.last_request.statements}/{budget}")
+            except QueryBudgetExceeded as e:
+                failures += 1
+                print(f"❌ {e}")
+
+    await engine.dispose()
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(run_budgets()) else 0)
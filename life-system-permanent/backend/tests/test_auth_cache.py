@@ -0,0 +1,130 @@
+"""
+Cache de principals (AuthService.get_current_user) e modo TOKEN_PRINCIPAL_CLAIMS.
+
+Roda sem PostgreSQL: a tabela users vive num SQLite em memória e uma Session
+síncrona é exposta com a interface assíncrona que o serviço usa.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.api.v1 import dependencies
+from app.core.security import create_access_token
+from app.models import User
+from app.services.auth_service import AuthService, principal_cache, principal_changed_at
+
+
+class SyncSessionAdapter:
+    """Session síncrona com os métodos assíncronos usados por AuthService."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+    async def rollback(self):
+        self.session.rollback()
+
+    async def close(self):
+        self.session.close()
+
+
+class NoQuerySession:
+    """Falha se a requisição for ao banco (deve ser atendida pelo cache)."""
+
+    async def execute(self, statement):
+        raise AssertionError("esperava um hit no cache de principals")
+
+
+@pytest.fixture
+def user_engine():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    with Session(engine) as session:
+        user = User(email="cache@example.com", username="cache", hashed_password="x", is_active=True)
+        session.add(user)
+        session.commit()
+    principal_cache.clear()
+    principal_changed_at.clear()
+    yield engine
+    principal_cache.clear()
+    principal_changed_at.clear()
+    engine.dispose()
+
+
+def test_cached_principal_survives_rollback_of_loading_session(user_engine):
+    async def scenario():
+        # Requisição 1: carrega o usuário e termina com rollback (ex.: 404 em PATCH /quests/{id}/complete)
+        db = SyncSessionAdapter(Session(user_engine))
+        first = await AuthService.get_current_user(db, 1)
+        await db.rollback()
+        await db.close()
+
+        # Requisição 2: hit no cache, sem sessão viva para o objeto
+        second = await AuthService.get_current_user(NoQuerySession(), 1)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert second is first
+    assert second.is_active is True
+    assert second.username == "cache"
+    assert second.email == "cache@example.com"
+
+
+def test_missing_user_is_not_cached(user_engine):
+    async def scenario():
+        db = SyncSessionAdapter(Session(user_engine))
+        try:
+            with pytest.raises(ValueError):
+                await AuthService.get_current_user(db, 999)
+        finally:
+            await db.close()
+
+    asyncio.run(scenario())
+    assert len(principal_cache) == 0
+
+
+def test_claims_principal_is_revoked_after_user_update(user_engine, monkeypatch):
+    monkeypatch.setattr(dependencies, "TOKEN_PRINCIPAL_CLAIMS", True)
+    token = create_access_token({"sub": "1", "username": "cache", "is_active": True})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    # Antes da alteração o token basta, sem banco
+    user = asyncio.run(dependencies.get_current_user(credentials, NoQuerySession()))
+    assert user.username == "cache"
+
+    # Desativação pelo ORM dispara o after_update
+    with Session(user_engine) as session:
+        session.get(User, 1).is_active = False
+        session.commit()
+
+    async def next_request():
+        db = SyncSessionAdapter(Session(user_engine))
+        try:
+            return await dependencies.get_current_user(credentials, db)
+        finally:
+            await db.close()
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(next_request())
+    assert exc.value.status_code == 401
+
+
+def test_claims_token_issued_after_update_skips_database(user_engine):
+    AuthService.invalidate_user(1)
+    token_payload = {"sub": "1", "username": "cache", "is_active": True}
+    stale = dict(token_payload, iat=principal_changed_at[1] - 1)
+    fresh = dict(token_payload, iat=principal_changed_at[1] + 1)
+
+    assert AuthService.principal_from_claims(1, stale) is None
+    assert AuthService.principal_from_claims(1, fresh).username == "cache"
@@ -0,0 +1,96 @@
+"""
+Tradução de IntegrityError no registro (AuthService.register / _conflict_message).
+
+As exceções imitam o que o asyncpg entrega: a DBAPIError do SQLAlchemy envolve
+o erro do driver em `__cause__`, com `sqlstate` e `constraint_name`.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.schemas import UserRegister
+from app.services import auth_service
+from app.services.auth_service import AuthService, _conflict_message
+
+
+class DriverError(Exception):
+    def __init__(self, message, sqlstate, constraint_name=None):
+        super().__init__(message)
+        self.sqlstate = sqlstate
+        self.constraint_name = constraint_name
+
+
+def integrity_error(message, sqlstate="23505", constraint_name=None):
+    orig = Exception(message)
+    orig.__cause__ = DriverError(message, sqlstate, constraint_name)
+    return IntegrityError("INSERT INTO users ...", {}, orig)
+
+
+class ConflictSession:
+    """Falha o INSERT com `error` e conta rollbacks."""
+
+    def __init__(self, error):
+        self.error = error
+        self.rollbacks = 0
+
+    async def execute(self, statement):
+        raise self.error
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def test_username_constraint():
+    error = integrity_error("duplicate key", constraint_name="ix_users_username")
+    assert _conflict_message(error) == "Username já existe"
+
+
+def test_email_constraint():
+    error = integrity_error("duplicate key", constraint_name="ix_users_email")
+    assert _conflict_message(error) == "Email já registrado"
+
+
+def test_message_fallback_without_constraint_name():
+    error = integrity_error('duplicate key value violates unique constraint "ix_users_email"')
+    assert _conflict_message(error) == "Email já registrado"
+
+
+def test_other_unique_constraint_is_not_translated():
+    error = integrity_error("duplicate key", constraint_name="player_stats_user_id_key")
+    assert _conflict_message(error) is None
+
+
+def test_non_unique_violation_mentioning_email_is_not_translated():
+    error = integrity_error('null value in column "email" violates not-null constraint', sqlstate="23502")
+    assert _conflict_message(error) is None
+
+
+def register_with(error, monkeypatch):
+    async def fake_hash(password):
+        return "hash"
+
+    monkeypatch.setattr(auth_service, "hash_password_async", fake_hash)
+    db = ConflictSession(error)
+    user_data = UserRegister(email="dup@example.com", username="dup", password="secret123")
+    return db, AuthService.register(db, user_data)
+
+
+def test_register_translates_email_conflict(monkeypatch):
+    db, register = register_with(integrity_error("duplicate key", constraint_name="ix_users_email"), monkeypatch)
+    with pytest.raises(ValueError, match="Email já registrado"):
+        asyncio.run(register)
+    assert db.rollbacks == 1
+
+
+def test_register_reraises_unrelated_integrity_error(monkeypatch):
+    error = integrity_error("insert or update violates foreign key", sqlstate="23503")
+    db, register = register_with(error, monkeypatch)
+    with pytest.raises(IntegrityError):
+        asyncio.run(register)
+    assert db.rollbacks == 1
@@ -0,0 +1,100 @@
+"""
+Validação de entrada dos endpoints de criação em lote e da listagem de quests.
+
+Os casos aqui são recusados antes de qualquer acesso ao banco, então o app real
+roda via httpx.ASGITransport com get_current_user/get_db sobrescritos.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+import pytest
+
+from app.api.v1.dependencies import get_current_user
+from app.api.v1.endpoints import body, gamification
+from app.core.database import get_db
+from app.main import app
+from app.models import User
+
+
+async def _no_db():
+    yield None
+
+
+@pytest.fixture(autouse=True)
+def authenticated():
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, username="bulk", is_active=True)
+    app.dependency_overrides[get_db] = _no_db
+    yield
+    app.dependency_overrides.clear()
+
+
+def post(url, content, headers):
+    async def request():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(url, content=content, headers=headers)
+
+    return asyncio.run(request())
+
+
+def get(url, params):
+    async def request():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(url, params=params)
+
+    return asyncio.run(request())
+
+
+@pytest.mark.parametrize("content_length", ["abc", "12x", "1e3"])
+def test_quest_bulk_malformed_content_length_is_400(content_length):
+    response = post("/api/v1/quests/bulk", b"[]", {"content-length": content_length})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Content-Length inválido"
+
+
+def test_quest_bulk_declared_oversize_is_413():
+    declared = str(gamification.BULK_QUEST_MAX_BYTES + 1)
+    response = post("/api/v1/quests/bulk", b"[]", {"content-length": declared})
+    assert response.status_code == 413
+
+
+def test_quest_bulk_invalid_ndjson_line_is_422():
+    content = b'{"title": "ok", "xp_reward": 10}\n{"title": 1}\n'
+    response = post("/api/v1/quests/bulk", content, {"content-type": "application/x-ndjson"})
+    assert response.status_code == 422
+
+
+def test_quest_bulk_empty_list_is_400():
+    response = post("/api/v1/quests/bulk", b"[]", {"content-type": "application/json"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("content_length", ["abc", "12x", "1e3"])
+def test_body_bulk_malformed_content_length_is_400(content_length):
+    response = post("/api/v1/body/bulk", b"[]", {"content-length": content_length})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Content-Length inválido"
+
+
+def test_body_bulk_declared_oversize_is_413():
+    declared = str(body.BULK_BODY_MAX_BYTES + 1)
+    response = post("/api/v1/body/bulk", b"[]", {"content-length": declared})
+    assert response.status_code == 413
+    assert response.json()["detail"] == "Payload muito grande"
+
+
+def test_quest_list_keeps_status_query_parameter():
+    response = get("/api/v1/quests", {"status": "nope"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "status"]
+
+
+def test_quest_list_malformed_cursor_is_400():
+    response = get("/api/v1/quests", {"status": "available", "cursor": "not-base64!"})
+    assert response.status_code == 400
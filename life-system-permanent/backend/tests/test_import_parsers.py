@@ -0,0 +1,170 @@
+"""
+Parsers de extrato (app/services/import_service.py): valores, CSV e OFX em blocos.
+
+Os parsers recebem um iterador assíncrono de texto; aqui o arquivo é fatiado em
+blocos de vários tamanhos para que as quebras caiam no meio de linhas, campos
+entre aspas e tags OFX.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from app.services.import_service import (
+    StatementFormatError,
+    _csv_rows,
+    _decoded_chunks,
+    _ofx_rows,
+    _parse_amount,
+    _to_record,
+)
+
+CHUNK_SIZES = [1, 3, 7, 64, 10_000]
+
+CSV_PT_BR = (
+    "Data;Descrição;Valor (R$)\r\n"
+    "01/02/2026;Mercado \"Central\";-1.234,56\r\n"
+    "\r\n"
+    "03/02/2026;\"Salário\nfevereiro\";5.000,00\r\n"
+    "04/02/2026;Padaria;-12,5\r\n"
+)
+
+OFX = """OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260201120000[-3:BRT]
+<TRNAMT>-45.90
+<MEMO>UBER *TRIP &amp; CIA
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20260205
+<TRNAMT>1500.00
+<NAME>RENDIMENTO
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+async def chunked(text, size):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def collect(parser, text, size):
+    async def run():
+        return [row async for row in parser(chunked(text, size))]
+
+    return asyncio.run(run())
+
+
+class ChunkedUpload:
+    """Upload que devolve blocos de bytes pré-definidos a cada read."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    async def read(self, size):
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("1.234,56", 1234.56),
+    ("1,234.56", 1234.56),
+    ("-1.234.567,89", -1234567.89),
+    ("1,234,567", 1234567.0),
+    ("R$ 1.500,00", 1500.0),
+    ("12,5", 12.5),
+    ("99.90", 99.9),
+    ("0,99", 0.99),
+    ("-42", -42.0),
+])
+def test_parse_amount_separator_conventions(raw, expected):
+    assert _parse_amount(raw) == expected
+
+
+@pytest.mark.parametrize("raw", ["1,234", "1.234"])
+def test_parse_amount_lone_separator_with_three_digits_is_thousands(raw):
+    assert _parse_amount(raw) == 1234.0
+
+
+@pytest.mark.parametrize("raw", ["", "   ", "abc", "1,2.3.4,5"])
+def test_parse_amount_rejects_garbage(raw):
+    with pytest.raises(ValueError):
+        _parse_amount(raw)
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_csv_rows_survive_chunk_boundaries(size):
+    rows = collect(_csv_rows, CSV_PT_BR, size)
+    assert rows == [
+        (2, {"date": "01/02/2026", "description": 'Mercado "Central"', "amount": "-1.234,56"}),
+        (4, {"date": "03/02/2026", "description": "Salário\nfevereiro", "amount": "5.000,00"}),
+        (6, {"date": "04/02/2026", "description": "Padaria", "amount": "-12,5"}),
+    ]
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_csv_comma_delimited_without_trailing_newline(size):
+    text = "date,amount,memo,type\n2026-02-01,\"1,234.56\",Freela,credito"
+    assert collect(_csv_rows, text, size) == [
+        (2, {"date": "2026-02-01", "amount": "1,234.56", "description": "Freela", "type": "credito"}),
+    ]
+
+
+def test_csv_missing_required_columns():
+    with pytest.raises(StatementFormatError, match="amount"):
+        collect(_csv_rows, "Data;Descrição\n01/02/2026;Mercado\n", 64)
+
+
+def test_csv_bad_row_is_reported_and_parsing_continues():
+    text = "data;valor;tipo\n01/02/2026;abc;despesa\n02/02/2026;10,00;talvez\n03/02/2026;10,00;despesa\n"
+    outcomes = []
+    for number, fields in collect(_csv_rows, text, 5):
+        try:
+            outcomes.append((number, _to_record(fields, {})))
+        except ValueError as e:
+            outcomes.append((number, str(e)))
+
+    assert outcomes[0][0] == 2 and isinstance(outcomes[0][1], str)
+    assert outcomes[1] == (3, "tipo inválido: 'talvez'")
+    assert outcomes[2] == (4, ("EXPENSE", 10.0, "Outros", None, datetime(2026, 2, 3)))
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_ofx_rows_survive_chunk_boundaries(size):
+    rows = collect(_ofx_rows, OFX, size)
+    assert rows == [
+        (1, {"date": "20260201120000[-3:BRT]", "amount": "-45.90", "description": "UBER *TRIP & CIA"}),
+        (2, {"date": "20260205", "amount": "1500.00", "description": "RENDIMENTO"}),
+    ]
+
+
+def test_ofx_records():
+    records = [_to_record(fields, {"uber": "Transporte", "rendimento": "Investimentos"})
+               for _, fields in collect(_ofx_rows, OFX, 64)]
+    assert records == [
+        ("EXPENSE", 45.9, "Transporte", "UBER *TRIP & CIA", datetime(2026, 2, 1, 12, 0, 0)),
+        ("INCOME", 1500.0, "Investimentos", "RENDIMENTO", datetime(2026, 2, 5)),
+    ]
+
+
+def test_decoded_chunks_keeps_multibyte_characters_split_across_reads():
+    raw = "Descrição;Açaí\n".encode("utf-8")
+    split = raw.index("ç".encode("utf-8")) + 1  # no meio do "ç"
+    progress = {"bytes_read": 0}
+
+    async def run():
+        upload = ChunkedUpload([raw[:split], raw[split:]])
+        return "".join([chunk async for chunk in _decoded_chunks(upload, "utf-8", progress)])
+
+    assert asyncio.run(run()) == "Descrição;Açaí\n"
+    assert progress["bytes_read"] == len(raw)
@@ -0,0 +1,115 @@
+"""
+Labels de rota do MetricsMiddleware e hooks SQL (app/core/metrics.py).
+
+As requisições passam pelo app real via httpx.ASGITransport, sem token: a
+autenticação recusa antes de qualquer acesso ao banco, mas a rota já foi casada.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core import metrics
+from app.core.metrics import RequestMetrics, current_request, install_sql_hooks, route_template
+from app.main import app
+
+
+async def _labels(requests):
+    labels = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for method, url in requests:
+            await client.request(method, url)
+            labels.append((method, metrics.last_request.route))
+    return labels
+
+
+def test_routes_sharing_router_relative_path_get_distinct_labels():
+    # finance, body, stats, rank e dashboard declaram todos "/" nos seus routers
+    labels = asyncio.run(_labels([
+        ("GET", "/api/v1/finance/"),
+        ("GET", "/api/v1/body/"),
+        ("GET", "/api/v1/stats/"),
+        ("GET", "/"),
+    ]))
+    assert labels == [
+        ("GET", "/api/v1/finance/"),
+        ("GET", "/api/v1/body/"),
+        ("GET", "/api/v1/stats/"),
+        ("GET", "/"),
+    ]
+
+
+def test_path_parameters_keep_the_router_prefix():
+    labels = asyncio.run(_labels([
+        ("PATCH", "/api/v1/quests/42/complete"),
+        ("GET", "/api/v1/finance/import/abc123"),
+    ]))
+    assert labels == [
+        ("PATCH", "/api/v1/quests/{quest_id}/complete"),
+        ("GET", "/api/v1/finance/import/{import_id}"),
+    ]
+
+
+def test_route_template_joins_root_path():
+    route = SimpleNamespace(path_format="/{quest_id}/complete")
+    scope = {"route": route, "root_path": "/life", "path": "/life/api/v1/quests/7/complete"}
+    assert route_template(scope) == "/life/api/v1/quests/{quest_id}/complete"
+
+    # Rotas já copiadas com o prefixo completo (FastAPI antigo) não mudam
+    route = SimpleNamespace(path_format="/api/v1/quests/{quest_id}/complete")
+    scope = {"route": route, "root_path": "", "path": "/api/v1/quests/7/complete"}
+    assert route_template(scope) == "/api/v1/quests/{quest_id}/complete"
+
+
+def test_unmatched_request():
+    assert route_template({"path": "/nope"}) == "unmatched"
+
+
+def test_metrics_endpoint_exposes_cache_counters():
+    async def scrape():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/metrics")
+
+    body = asyncio.run(scrape()).text
+    for cache in ("token", "principal"):
+        assert f'life_cache_hits_total{{cache="{cache}"}} ' in body
+        assert f'life_cache_misses_total{{cache="{cache}"}} ' in body
+        assert f'life_cache_entries{{cache="{cache}"}} ' in body
+
+
+def test_render_prometheus_cache_values():
+    text = metrics.render_prometheus(caches={"token": {"hits": 3, "misses": 1, "size": 2}})
+    assert "# TYPE life_cache_hits_total counter" in text
+    assert 'life_cache_hits_total{cache="token"} 3' in text
+    assert 'life_cache_misses_total{cache="token"} 1' in text
+    assert 'life_cache_entries{cache="token"} 2' in text
+
+
+def test_failing_statement_does_not_leak_start_time():
+    engine = create_engine("sqlite://")
+    install_sql_hooks(engine)
+    request = RequestMetrics()
+    token = current_request.set(request)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM tabela_inexistente"))
+            assert conn.info["query_start"] == []
+
+            conn.execute(text("SELECT 1"))
+            assert conn.info["query_start"] == []
+    finally:
+        current_request.reset(token)
+        engine.dispose()
+
+    assert request.statements == 1
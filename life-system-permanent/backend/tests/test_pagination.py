@@ -0,0 +1,126 @@
+"""
+Paginação keyset (app/core/pagination.py) e seu uso nas listagens.
+"""
+
+import os
+import sys
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.future import select
+
+from app.core.pagination import apply_keyset, decode_cursor, encode_cursor, split_page
+from app.models import BodyMetric, FinanceTransaction, Quest
+
+Row = namedtuple("Row", ["id", "date"])
+
+
+def compile_pg(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def quest_rows(n):
+    start = datetime(2026, 10, 1, 12, 0, 0, 123456)
+    return [{"id": 100 - i, "created_at": start - timedelta(minutes=i), "title": f"q{i}"} for i in range(n)]
+
+
+def test_quest_created_at_is_not_nullable():
+    assert Quest.__table__.c.created_at.nullable is False
+
+
+def test_quest_cursor_round_trip():
+    rows = quest_rows(6)
+    page, cursor = split_page(rows, 5, key=lambda row: (row["created_at"], row["id"]))
+
+    assert page == rows[:5]
+    assert decode_cursor(cursor) == (rows[4]["created_at"], rows[4]["id"])
+
+
+def test_quest_last_page_has_no_cursor():
+    rows = quest_rows(3)
+    page, cursor = split_page(rows, 5, key=lambda row: (row["created_at"], row["id"]))
+    assert page == rows
+    assert cursor is None
+
+
+def test_quest_keyset_uses_plain_row_comparison():
+    rows = quest_rows(6)
+    _, cursor = split_page(rows, 5, key=lambda row: (row["created_at"], row["id"]))
+
+    stmt = apply_keyset(select(Quest.id), Quest.created_at, Quest.id, cursor=cursor, skip=0, limit=5)
+    sql = compile_pg(stmt)
+    # Mesma ordem do ix_quests_user_open_created (sem coalesce)
+    assert "(quests.created_at, quests.id) < (" in sql
+    assert "ORDER BY quests.created_at DESC, quests.id DESC" in sql
+
+
+def test_cursor_round_trip():
+    date = datetime(2026, 1, 31, 23, 59, 59, 999999)
+    assert decode_cursor(encode_cursor(date, 42)) == (date, 42)
+
+
+def test_cursor_round_trip_null_date():
+    assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor(datetime(2026, 5, 17, 8, 30), 123456789)
+    assert "=" not in cursor
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor(datetime(2026, 1, 1), 1)[:-3], "WzFd"])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_split_page_exact_limit_has_no_cursor():
+    rows = [Row(i, datetime(2026, 1, 1) - timedelta(days=i)) for i in range(3)]
+    assert split_page(rows, 3) == (rows, None)
+
+
+def test_split_page_drops_sentinel_and_points_at_last_item():
+    rows = [Row(10 - i, datetime(2026, 1, 1) - timedelta(days=i)) for i in range(4)]
+    page, cursor = split_page(rows, 3)
+    assert page == rows[:3]
+    assert decode_cursor(cursor) == (rows[2].date, rows[2].id)
+
+
+def test_split_page_null_date():
+    rows = [Row(3, None), Row(2, None)]
+    page, cursor = split_page(rows, 1)
+    assert page == rows[:1]
+    assert decode_cursor(cursor) == (None, 3)
+
+
+@pytest.mark.parametrize("model", [FinanceTransaction, BodyMetric])
+def test_not_null_date_columns_use_index_order(model):
+    table = model.__tablename__
+    cursor = encode_cursor(datetime(2026, 1, 1), 5)
+    sql = compile_pg(apply_keyset(select(model.id), model.date, model.id, cursor=cursor, skip=0, limit=10))
+    assert f"({table}.date, {table}.id) < (" in sql
+    assert f"ORDER BY {table}.date DESC, {table}.id DESC" in sql
+    assert "coalesce" not in sql
+
+
+def test_nullable_date_column_sorts_nulls_last():
+    sql = compile_pg(apply_keyset(select(Quest.id), Quest.due_date, Quest.id, cursor=None, skip=0, limit=10))
+    assert "ORDER BY coalesce(quests.due_date, '-infinity'::timestamp) DESC, quests.id DESC" in sql
+
+
+def test_nullable_date_column_null_cursor_continues_inside_null_rows():
+    cursor = encode_cursor(None, 9)
+    sql = compile_pg(apply_keyset(select(Quest.id), Quest.due_date, Quest.id, cursor=cursor, skip=0, limit=10))
+    assert "(coalesce(quests.due_date, '-infinity'::timestamp), quests.id) < ('-infinity'::timestamp, " in sql
+
+
+def test_skip_without_cursor_is_offset():
+    sql = compile_pg(apply_keyset(select(FinanceTransaction.id), FinanceTransaction.date, FinanceTransaction.id,
+                                  cursor=None, skip=20, limit=10))
+    assert "OFFSET" in sql
+    assert "LIMIT" in sql
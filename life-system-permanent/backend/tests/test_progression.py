@@ -0,0 +1,67 @@
+"""
+ProgressionTable.apply_xp (app/services/progression.py) nos limites da tabela.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from app.services.progression import CURVES, MAX_TOTAL_XP, ProgressionTable
+
+
+@pytest.fixture
+def table():
+    # linear: 100, 200, 300, 400 XP por nível -> limiares 0, 100, 300, 600, 1000
+    return ProgressionTable(CURVES["linear"], max_level=5)
+
+
+def test_thresholds(table):
+    assert list(table.thresholds) == [0, 100, 300, 600, 1000]
+    assert table.max_level == 5
+    assert table.max_level_xp == 500
+
+
+def test_below_threshold_keeps_level(table):
+    assert table.apply_xp(1, 0, 99) == (1, 99)
+
+
+def test_exact_threshold_levels_up(table):
+    assert table.apply_xp(1, 0, 100) == (2, 0)
+    assert table.apply_xp(2, 150, 50) == (3, 0)
+
+
+def test_multi_level_jump(table):
+    assert table.apply_xp(1, 50, 600) == (4, 50)
+
+
+def test_reaching_max_level_caps_xp(table):
+    assert table.apply_xp(4, 0, 400) == (5, 0)
+    assert table.apply_xp(1, 0, 10_000) == (5, 500)
+
+
+def test_at_max_level_xp_stops_growing(table):
+    assert table.apply_xp(5, 450, 30) == (5, 480)
+    assert table.apply_xp(5, 480, 1_000_000) == (5, 500)
+    # XP acima do teto (salvo antes dele existir) é normalizado
+    assert table.apply_xp(5, 9_999, 0) == (5, 500)
+
+
+def test_level_above_max_never_decreases(table):
+    # Nível salvo com uma tabela/curva anterior, maior que o máximo atual
+    assert table.apply_xp(8, 20, 0) == (8, 20)
+    assert table.apply_xp(8, 20, 10_000) == (8, 500)
+
+
+def test_zero_gain_is_identity_below_max(table):
+    assert table.apply_xp(3, 120, 0) == (3, 120)
+
+
+def test_truncated_curve_stays_within_integer():
+    table = ProgressionTable(CURVES["exponential"], max_level=10_000)
+    assert table.thresholds[-1] <= MAX_TOTAL_XP
+    level, xp = table.apply_xp(table.max_level, 0, MAX_TOTAL_XP)
+    assert level == table.max_level
+    assert table.thresholds[-1] + xp <= MAX_TOTAL_XP
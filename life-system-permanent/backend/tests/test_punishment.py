@@ -0,0 +1,113 @@
+"""
+PunishmentService (app/services/punishment_service.py): controle de lotes do sweep.
+
+O statement em si é SQL de PostgreSQL; aqui a sessão devolve lotes prontos
+(uma linha por usuário, como o SELECT final do CTE) para exercitar o loop.
+"""
+
+import asyncio
+import os
+import sys
+from collections import namedtuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.punishment_service import (
+    PlayerStatsNotFoundError,
+    PunishmentService,
+    build_punishment_statement,
+)
+
+PunishedRow = namedtuple("PunishedRow", ["user_id", "hp", "total_damage", "quests_failed", "quest_ids"])
+
+
+class BatchSession:
+    """Devolve um lote por execute e conta commits e rollbacks."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.executions = 0
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement):
+        self.executions += 1
+        return self
+
+    def all(self):
+        return self.batches.pop(0) if self.batches else []
+
+    def first(self):
+        rows = self.all()
+        return rows[0] if rows else None
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def test_statement_reports_users_without_stats():
+    sql = str(build_punishment_statement(limit=10).compile(dialect=postgresql.dialect()))
+    assert "punished AS" in sql
+    assert "FROM damage LEFT OUTER JOIN punished ON punished.user_id = damage.user_id" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+
+
+def test_full_batch_with_every_row_skipped_keeps_sweeping():
+    # Lote cheio só de usuários sem player_stats: nenhum punido, mas a fila andou
+    db = BatchSession([
+        [PunishedRow(1, None, 30, 2, [1, 2]), PunishedRow(2, None, 10, 2, [3, 4])],
+        [PunishedRow(3, 70, 30, 1, [5])],
+    ])
+
+    stats = asyncio.run(PunishmentService.sweep(db, batch_size=4))
+
+    assert db.executions == 2
+    assert db.commits == 2
+    assert stats["quests_failed"] == 5
+    assert stats["users_punished"] == 1
+
+
+def test_partial_batch_stops_even_when_every_row_is_punished():
+    db = BatchSession([
+        [PunishedRow(1, 50, 50, 3, [1, 2, 3])],
+        [PunishedRow(2, 90, 10, 1, [4])],
+    ])
+
+    stats = asyncio.run(PunishmentService.sweep(db, batch_size=4))
+
+    assert db.executions == 1
+    assert stats["quests_failed"] == 3
+    assert stats["users_punished"] == 1
+
+
+def test_empty_queue_stops_after_one_statement():
+    db = BatchSession([[]])
+    stats = asyncio.run(PunishmentService.sweep(db, batch_size=4))
+    assert db.executions == 1
+    assert stats["quests_failed"] == 0
+
+
+def test_check_user_reports_punishment():
+    db = BatchSession([[PunishedRow(1, 0, 120, 2, [9, 4])]])
+    outcome = asyncio.run(PunishmentService.check_user(db, 1))
+    assert outcome == {"processed_quests": [4, 9], "total_damage": 120, "current_hp": 0, "is_dead": True}
+    assert db.commits == 1
+
+
+def test_check_user_without_overdue_quests_returns_none():
+    db = BatchSession([[]])
+    assert asyncio.run(PunishmentService.check_user(db, 1)) is None
+
+
+def test_check_user_without_stats_is_distinct_and_rolls_back():
+    db = BatchSession([[PunishedRow(1, None, 30, 1, [7])]])
+    with pytest.raises(PlayerStatsNotFoundError):
+        asyncio.run(PunishmentService.check_user(db, 1))
+    assert db.commits == 0
+    assert db.rollbacks == 1
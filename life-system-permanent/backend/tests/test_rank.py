@@ -0,0 +1,86 @@
+"""
+Leaderboard em memória (app/services/rank_service.py): escritas absolutas e rebuild.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from app.services import rank_service
+from app.services.rank_service import Leaderboard, RankService
+
+
+def player(user_id, username, level=1, current_xp=0, strength=1, intelligence=1, focus=1):
+    return {
+        "user_id": user_id, "username": username, "level": level, "current_xp": current_xp,
+        "strength": strength, "intelligence": intelligence, "focus": focus,
+    }
+
+
+class StaleSnapshotSession:
+    """
+    Devolve `rows` como o SELECT do rebuild e, depois que o snapshot foi lido,
+    simula conclusões de quest commitadas antes da troca do leaderboard.
+    """
+
+    def __init__(self, rows, writes):
+        self.rows = rows
+        self.writes = writes
+
+    async def execute(self, statement):
+        for user_id, fields in self.writes:
+            RankService.record(user_id, **fields)
+        return self
+
+    def mappings(self):
+        return self.rows
+
+
+@pytest.fixture(autouse=True)
+def board():
+    rank_service.leaderboard = Leaderboard.from_rows([
+        player(1, "ana", level=3, strength=5),
+        player(2, "bia", level=2, strength=2),
+    ])
+    yield
+    rank_service.leaderboard = Leaderboard()
+
+
+def test_record_uses_absolute_values_for_unknown_player():
+    # Jogador ausente deste worker (ex.: registrado em outro): nada de base "1 + delta"
+    RankService.record(3, username="caio", level=4, current_xp=10, strength=7, intelligence=3, focus=2, hp=120)
+
+    assert rank_service.leaderboard.players[3] == {
+        "username": "caio", "level": 4, "current_xp": 10,
+        "strength": 7, "intelligence": 3, "focus": 2,
+    }
+    assert rank_service.leaderboard.rank_of(3, "level") == 1
+    assert rank_service.leaderboard.rank_of(3, "strength") == 1
+
+
+def test_writes_during_rebuild_are_replayed():
+    rows = [player(1, "ana", level=3, strength=5), player(2, "bia", level=2, strength=2)]
+    writes = [
+        (2, {"username": "bia", "level": 5, "current_xp": 40, "strength": 9, "intelligence": 1, "focus": 1}),
+        (4, {"username": "davi"}),
+    ]
+
+    players = asyncio.run(RankService.load(StaleSnapshotSession(rows, writes)))
+
+    board = rank_service.leaderboard
+    assert players == 3
+    assert board.players[2]["level"] == 5
+    assert board.rank_of(2, "level") == 1
+    assert board.rank_of(2, "strength") == 1
+    assert board.players[4]["username"] == "davi"
+    assert rank_service._pending is None
+
+
+def test_record_outside_rebuild_is_not_buffered():
+    RankService.record(1, level=9)
+    assert rank_service._pending is None
+    assert rank_service.leaderboard.rank_of(1, "level") == 1
@@ -0,0 +1,101 @@
+"""
+Séries de tendência (app/services/trend_service.py): LTTB, média móvel e taxa de variação.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+
+from app.services.trend_service import lttb, moving_average, rate_of_change
+
+
+def series(n):
+    x = np.arange(n, dtype=np.float64)
+    return x, np.sin(x / 5.0)
+
+
+@pytest.mark.parametrize("threshold", [10, 11, 50])
+def test_lttb_threshold_at_or_above_length_keeps_everything(threshold):
+    x, y = series(10)
+    assert lttb(x, y, threshold).tolist() == list(range(10))
+
+
+@pytest.mark.parametrize("threshold", [0, 1, 2])
+def test_lttb_threshold_below_three_keeps_everything(threshold):
+    x, y = series(10)
+    assert lttb(x, y, threshold).tolist() == list(range(10))
+
+
+@pytest.mark.parametrize("n, threshold", [(100, 3), (100, 10), (1000, 200), (11, 10)])
+def test_lttb_keeps_endpoints_and_order(n, threshold):
+    x, y = series(n)
+    selected = lttb(x, y, threshold)
+    assert selected.size == threshold
+    assert selected[0] == 0
+    assert selected[-1] == n - 1
+    assert np.all(np.diff(selected) > 0)
+
+
+def test_lttb_keeps_a_spike():
+    x = np.arange(100, dtype=np.float64)
+    y = np.zeros(100)
+    y[37] = 10.0
+    assert 37 in lttb(x, y, 10).tolist()
+
+
+def test_lttb_empty_series():
+    empty = np.array([], dtype=np.float64)
+    assert lttb(empty, empty, 200).size == 0
+
+
+def test_moving_average_partial_windows_at_the_start():
+    y = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    assert moving_average(y, 3).tolist() == [1.0, 1.5, 2.0, 3.0, 4.0]
+
+
+def test_moving_average_window_of_one_is_identity():
+    y = np.array([3.0, 1.0, 4.0, 1.0])
+    assert moving_average(y, 1).tolist() == y.tolist()
+
+
+def test_moving_average_window_larger_than_series_is_cumulative_mean():
+    y = np.array([2.0, 4.0, 6.0])
+    assert moving_average(y, 10).tolist() == [2.0, 3.0, 4.0]
+
+
+def test_moving_average_empty_series():
+    assert moving_average(np.array([], dtype=np.float64), 7).size == 0
+
+
+def test_rate_of_change_matches_gradient_on_distinct_timestamps():
+    x = np.array([0.0, 1.0, 2.0, 4.0, 5.0])
+    y = np.array([80.0, 79.5, 79.0, 78.0, 77.5])
+    assert rate_of_change(x, y) == pytest.approx([-0.5] * 5)
+
+    x = np.arange(6, dtype=np.float64)
+    y = x ** 2
+    assert rate_of_change(x, y).tolist() == np.gradient(y, x).tolist()
+
+
+def test_rate_of_change_zero_span_is_zero():
+    # Três medições no mesmo instante: a do meio não tem intervalo para dividir
+    x = np.array([0.0, 1.0, 1.0, 1.0, 2.0])
+    y = np.array([80.0, 79.0, 81.0, 78.0, 77.0])
+    rates = rate_of_change(x, y)
+    assert np.all(np.isfinite(rates))
+    assert rates[2] == 0.0
+    assert rates[1] == pytest.approx(1.0)
+
+
+def test_rate_of_change_all_points_at_the_same_instant():
+    rates = rate_of_change(np.zeros(3), np.array([70.0, 71.0, 72.0]))
+    assert rates.tolist() == [0.0, 0.0, 0.0]
+
+
+@pytest.mark.parametrize("size", [0, 1])
+def test_rate_of_change_short_series_is_zero(size):
+    assert rate_of_change(np.zeros(size), np.full(size, 70.0)).tolist() == [0.0] * size